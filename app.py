@@ -1,79 +1,289 @@
-from flask import Flask, render_template, request, jsonify, redirect, url_for, session
-import json
+from flask import Flask, render_template, request, jsonify, redirect, url_for, session, g, abort, has_request_context
+from flask import Response, send_from_directory, stream_with_context
+import gzip
+import io
+import mimetypes
 import os
-import uuid
+import random
 import re
-import shutil
+import threading
+import time
+import traceback
+import uuid
 from datetime import datetime
-from flask import Flask, render_template, jsonify, request, send_from_directory
+from functools import wraps
+
+import name_filter
+import name_store
+import name_transfer
+import session_store
+import static_assets
+from name_store import DEFAULT_WORKSPACE
 
 # Import name_generator functions for local generation
-from name_generator import generate_team_name, generate_batch, get_random_team_name
+from name_generator import generate_team_name, generate_batch, get_random_team_name, load_patterns, record_usage
+
+# Pattern to match a JSON object with a name field, e.g. {"name": "Robo Falcons"}
+JSON_NAME_PATTERN = re.compile(r'^\s*{\s*"name"\s*:\s*"(.+?)".*}\s*$')
+
+# Caching and compression of static assets and API responses
+ASSET_MAX_AGE = 365 * 24 * 60 * 60  # Hashed asset files never change
+GZIP_MIN_BYTES = 1024  # Smaller JSON responses aren't worth compressing
 
 # Global variables to track generated names and avoid repetition
 RECENT_GENERATED_NAMES = set()
 MAX_RECENT_NAMES = 100  # How many recent names to remember
 
-# Initialize Flask app
+# Initialize Flask app - routes are registered at import, but nothing touches
+# the filesystem until create_app() (or the first request) runs the startup phases
 app = Flask(__name__)
 app.secret_key = 'fll_team_name_generator_secret_key_2025'  # Less secure but easier to manage
 
-# Print startup message
-print("Starting FLL Team Name Generator...")
-
-# Ensure data directory exists
-DATA_DIR = os.path.join(os.path.dirname(__file__), 'data')
+# Data directory layout
+DATA_DIR = name_store.DATA_DIR
 NAMES_FILE = os.path.join(DATA_DIR, 'names.json')
 BACKUP_DIR = os.path.join(DATA_DIR, 'backups')
 
-if not os.path.exists(DATA_DIR):
-    os.makedirs(DATA_DIR)
+# Startup configuration
+WARMUP_MODES = ('eager', 'lazy')  # Warm up in a background thread at startup, or on the first request
+DEFAULT_WARMUP_MODE = os.environ.get('WARMUP_MODE', 'eager')
+
+# Server-side vote storage - the session cookie only carries a session ID (set by create_app)
+VOTE_STORE = None
+
+# Bundled, fingerprinted assets from static_assets.py (empty if not built)
+ASSET_MANIFEST = {}
+
+# Seconds spent in each startup and warm-up phase, for tuning cold starts
+STARTUP_TIMINGS = {}
+
+_startup_lock = threading.Lock()
+_warmup_lock = threading.Lock()
+_started = False
+_warmed_up = False
+
+# Workspaces whose saved names have been counted by record_usage()
+_usage_seeded = set()
+_usage_seeded_lock = threading.Lock()
 
-# Create backups directory if it doesn't exist
-if not os.path.exists(BACKUP_DIR):
-    os.makedirs(BACKUP_DIR)
+def _init_storage():
+    # Create the default workspace shard (data/names.json and data/backups)
+    name_store.get_store(DEFAULT_WORKSPACE).initialize()
 
-# Initialize names.json if it doesn't exist
-if not os.path.exists(NAMES_FILE):
-    with open(NAMES_FILE, 'w') as f:
-        json.dump([], f)
+def _init_sessions():
+    global VOTE_STORE
+    VOTE_STORE = session_store.create_vote_store(
+        backend=os.environ.get('SESSION_BACKEND', 'sqlite'),
+        ttl_seconds=int(os.environ.get('SESSION_TTL_SECONDS', session_store.DEFAULT_TTL_SECONDS))
+    )
+
+def _init_assets():
+    global ASSET_MANIFEST
+    ASSET_MANIFEST = static_assets.load_manifest()
+
+def _seed_usage(store):
+    # Count a workspace's saved names the first time it is used, so usage-aware
+    # word sampling steers away from them too
+    with _usage_seeded_lock:
+        if store.workspace_id in _usage_seeded:
+            return
+        _usage_seeded.add(store.workspace_id)
+    record_usage(store.load())
+
+def _warm_usage():
+    _seed_usage(name_store.get_store(DEFAULT_WORKSPACE))
+
+# Cheap phases every request depends on, run by create_app()
+STARTUP_PHASES = [
+    ('storage', _init_storage),
+    ('sessions', _init_sessions),
+    ('assets', _init_assets)
+]
+
+# Heavy phases, run in the background or on the first request
+WARMUP_PHASES = [
+    ('lexicon', load_patterns),
+    ('usage', _warm_usage),
+    ('blocklist', name_filter.get_blocklist)
+]
+
+def _run_phases(phases):
+    start = time.perf_counter()
+    for name, init in phases:
+        phase_start = time.perf_counter()
+        init()
+        STARTUP_TIMINGS[name] = time.perf_counter() - phase_start
+        print(f"  {name}: {STARTUP_TIMINGS[name] * 1000:.1f} ms")
+    return time.perf_counter() - start
+
+def create_app(warmup=None):
+    """
+    Run the startup phases and return the app (only the first call does any work).
+    
+    Startup creates the data files, opens the vote store and reads the asset
+    manifest. The heavier warm-up (word lexicon and name patterns, usage
+    counts, blocklist) either starts in a background thread right away
+    ("eager") or runs on the first request ("lazy"). Requests that arrive
+    during an eager warm-up wait for it to finish.
+    
+    Args:
+        warmup (str, optional): "eager" or "lazy"; defaults to the WARMUP_MODE
+            environment variable, or "eager"
+        
+    Returns:
+        Flask: The application
+        
+    Raises:
+        ValueError: If the warm-up mode is unknown
+    """
+    global _started
+    
+    warmup = warmup or DEFAULT_WARMUP_MODE
+    if warmup not in WARMUP_MODES:
+        raise ValueError(f"Unknown warm-up mode: {warmup!r} (expected one of {', '.join(WARMUP_MODES)})")
+    
+    with _startup_lock:
+        if _started:
+            return app
+        
+        print("Starting FLL Team Name Generator...")
+        elapsed = _run_phases(STARTUP_PHASES)
+        print(f"Started in {elapsed * 1000:.1f} ms ({warmup} warm-up)")
+        _started = True
+    
+    if warmup == 'eager':
+        threading.Thread(target=warm_up, name="warm-up", daemon=True).start()
+    return app
+
+def warm_up():
+    """Run the warm-up phases once; later calls return immediately"""
+    global _warmed_up
+    
+    with _warmup_lock:
+        if _warmed_up:
+            return
+        print("Warming up...")
+        elapsed = _run_phases(WARMUP_PHASES)
+        print(f"Warm-up finished in {elapsed * 1000:.1f} ms")
+        _warmed_up = True
+
+@app.before_request
+def ensure_started():
+    # Supports servers that import app:app directly instead of calling create_app()
+    if not _started:
+        create_app()
+    if not _warmed_up and request.endpoint not in ('static', 'dist_asset'):
+        warm_up()
+
+# Workspace handling - every page and API route is also available under a
+# workspace prefix (/w/<workspace_id>/... and /api/w/<workspace_id>/...)
+@app.url_value_preprocessor
+def pull_workspace_id(endpoint, values):
+    workspace_id = values.pop('workspace_id', None) if values else None
+    if workspace_id is not None and not name_store.is_valid_workspace_id(workspace_id):
+        abort(404)
+    g.workspace_id = workspace_id
+
+@app.url_defaults
+def add_workspace_id(endpoint, values):
+    workspace_id = g.get('workspace_id')
+    if not workspace_id or 'workspace_id' in values:
+        return
+    if app.url_map.is_endpoint_expecting(endpoint, 'workspace_id'):
+        values['workspace_id'] = workspace_id
+
+@app.context_processor
+def inject_workspace():
+    workspace_id = g.get('workspace_id')
+    return {
+        'workspace_id': workspace_id or DEFAULT_WORKSPACE,
+        'api_base': f"/api/w/{workspace_id}" if workspace_id else "/api"
+    }
+
+@app.context_processor
+def inject_assets():
+    def asset_urls(name):
+        """URLs of the built bundle for name, or of its source files if not built"""
+        manifest = {} if app.debug else ASSET_MANIFEST
+        return [
+            url_for('dist_asset', filename=filename) if directory == 'dist'
+            else url_for('static', filename=filename)
+            for directory, filename in static_assets.asset_files(name, manifest)
+        ]
+    return {'asset_urls': asset_urls}
+
+@app.route('/assets/<path:filename>')
+def dist_asset(filename):
+    """Serve a fingerprinted asset, pre-gzipped if the client accepts it"""
+    if request.accept_encodings['gzip'] and os.path.isfile(os.path.join(static_assets.DIST_DIR, filename + '.gz')):
+        response = send_from_directory(static_assets.DIST_DIR, filename + '.gz', max_age=ASSET_MAX_AGE,
+                                       mimetype=mimetypes.guess_type(filename)[0])
+        response.headers['Content-Encoding'] = 'gzip'
+    else:
+        response = send_from_directory(static_assets.DIST_DIR, filename, max_age=ASSET_MAX_AGE)
+    response.vary.add('Accept-Encoding')
+    response.cache_control.immutable = True
+    return response
+
+@app.after_request
+def compress_json(response):
+    """Gzip large JSON responses for clients that accept it"""
+    if (response.mimetype != 'application/json' or response.direct_passthrough or response.is_streamed
+            or not 200 <= response.status_code < 300 or 'Content-Encoding' in response.headers):
+        return response
+    
+    response.vary.add('Accept-Encoding')
+    if not request.accept_encodings['gzip']:
+        return response
+    
+    data = response.get_data()
+    if len(data) >= GZIP_MIN_BYTES:
+        response.set_data(gzip.compress(data, compresslevel=6))
+        response.headers['Content-Encoding'] = 'gzip'
+    return response
 
 # Helper functions
+def current_store():
+    """Get the name store for the workspace of the current request"""
+    workspace_id = g.get('workspace_id') if has_request_context() else None
+    store = name_store.get_store(workspace_id)
+    _seed_usage(store)
+    return store
+
 def load_names():
-    try:
-        with open(NAMES_FILE, 'r') as f:
-            return json.load(f)
-    except (json.JSONDecodeError, FileNotFoundError):
-        return []
+    return current_store().load()
 
 def save_names(names):
-    with open(NAMES_FILE, 'w') as f:
-        json.dump(names, f, indent=2)
+    current_store().save(names)
         
 def create_backup():
-    """Create a timestamped backup of the current names.json file"""
-    try:
-        # Check if the names file exists
-        if not os.path.exists(NAMES_FILE):
-            return None
-            
-        # Generate timestamp for the backup filename
-        timestamp = datetime.now().strftime("%Y%m%d-%H%M%S")
-        backup_filename = f"names-{timestamp}.json.bak"
-        backup_path = os.path.join(BACKUP_DIR, backup_filename)
-        
-        # Copy the current file to the backup location
-        import shutil
-        shutil.copy2(NAMES_FILE, backup_path)
-        
-        print(f"Created backup: {backup_path}")
-        return backup_filename
-    except Exception as e:
-        print(f"Error creating backup: {str(e)}")
-        return None
+    """Create a timestamped backup of the current workspace's names file"""
+    return current_store().create_backup()
+
+def current_session_id():
+    """Get the visitor's session ID, creating one on their first request"""
+    session_id = session.get('sid')
+    if not session_id:
+        session_id = uuid.uuid4().hex
+        session['sid'] = session_id
+    
+    # Move votes from cookies issued before votes were stored server-side
+    legacy_votes = session.pop('voted_names', None)
+    if legacy_votes:
+        VOTE_STORE.add_votes(session_id, legacy_votes)
+    
+    return session_id
+
+def locks_workspace(view):
+    """Hold the workspace's store lock across a view's load-modify-save cycle"""
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        with current_store().lock:
+            return view(*args, **kwargs)
+    return wrapper
         
 def clean_team_name(name):
-    """Clean team name by removing any JSON formatting"""
+    """Clean team name by removing any JSON formatting and normalizing it"""
     if not name:
         return name
     
@@ -84,14 +294,11 @@ def clean_team_name(name):
         cleaned = cleaned[1:-1]
     
     # Remove JSON object notation if present
-    import re
-    # Pattern to match JSON object with name field
-    json_pattern = r'^\s*{\s*"name"\s*:\s*"(.+?)".*}\s*$'
-    match = re.match(json_pattern, cleaned)
+    match = JSON_NAME_PATTERN.match(cleaned)
     if match:
         cleaned = match.group(1)
     
-    return cleaned
+    return name_filter.normalize_name(cleaned)
 
 def generate_batch_id():
     """Generate a unique batch ID using timestamp and random string"""
@@ -108,7 +315,6 @@ def generate_local_name():
 
 
 # Track the last API request time for rate limiting
-from datetime import datetime
 last_api_request_time = datetime.now()
 
 def generate_team_name(batch_mode=False, session_id=None):
@@ -127,7 +333,6 @@ def generate_team_name(batch_mode=False, session_id=None):
     current_time = datetime.now()
     time_since_last_request = (current_time - last_api_request_time).total_seconds()
     if time_since_last_request < 0.5:  # 0.5-second cooldown
-        import time
         time.sleep(0.5 - time_since_last_request)
     
     # Update the last request time
@@ -147,8 +352,9 @@ def generate_team_name(batch_mode=False, session_id=None):
     for _ in range(5):  # Try up to 5 times to avoid duplicates
         name_data = get_random_team_name()
         
-        # Check if this name is in our avoid list
-        if name_data["name"].lower() not in [name.lower() for name in avoid_names]:
+        # Check if this name is in our avoid list and passes the input filter
+        if name_data["name"].lower() not in [name.lower() for name in avoid_names] and \
+           name_filter.is_allowed(name_data["name"]):
             # Add to recent names
             RECENT_GENERATED_NAMES.add(name_data["name"])
             if len(RECENT_GENERATED_NAMES) > MAX_RECENT_NAMES:
@@ -165,9 +371,16 @@ def generate_team_name(batch_mode=False, session_id=None):
             print(f"Generated team name: {name_data['name']}")
             return name_data
         
-    # If we couldn't generate a unique name after 5 tries, add a random suffix
-    name_data = get_random_team_name()
-    name_data["name"] = f"{name_data['name']} {random.randint(1, 99)}"
+    # If we couldn't generate a unique name after 5 tries, add a random suffix.
+    # The suffix can make a long name too long, so it goes through the filter too.
+    for _ in range(20):
+        name_data = get_random_team_name()
+        name_data["name"] = f"{name_data['name']} {random.randint(1, 99)}"
+        if name_data["name"].lower() not in [name.lower() for name in avoid_names] and \
+           name_filter.is_allowed(name_data["name"]):
+            break
+    else:
+        raise ValueError("Couldn't generate a team name that passes the input filter")
     
     # Add to recent names
     RECENT_GENERATED_NAMES.add(name_data["name"])
@@ -187,38 +400,44 @@ def generate_team_name(batch_mode=False, session_id=None):
 
 # Routes
 @app.route('/')
+@app.route('/w/<workspace_id>/')
 def index():
     return render_template('index.html')
 
 @app.route('/generate')
+@app.route('/w/<workspace_id>/generate')
 def generate():
     return render_template('generate.html')
 
 @app.route('/batch')
+@app.route('/w/<workspace_id>/batch')
 def batch():
     return render_template('batch.html')
 
 @app.route('/finalize')
+@app.route('/w/<workspace_id>/finalize')
 def finalize():
     return render_template('finalize.html')
 
 @app.route('/vote')
+@app.route('/w/<workspace_id>/vote')
 def vote():
     names = load_names()
     return render_template('vote.html', names=names)
 
 @app.route('/reset')
+@app.route('/w/<workspace_id>/reset')
 def reset():
     # Hidden admin reset page - not linked from anywhere
     return render_template('reset.html')
 
 # API Endpoints
 @app.route('/api/generate-name', methods=['POST'])
+@app.route('/api/w/<workspace_id>/generate-name', methods=['POST'])
 def api_generate_name():
     """API endpoint to generate a new team name"""
     print("API endpoint called: /api/generate-name")
     # Add a timestamp to ensure we get a fresh response
-    import time
     current_time = time.time()
     print(f"Request time: {current_time}")
     
@@ -263,11 +482,11 @@ def api_generate_name():
     })
 
 @app.route('/api/generate-batch', methods=['POST'])
+@app.route('/api/w/<workspace_id>/generate-batch', methods=['POST'])
 def api_generate_batch():
     """API endpoint to generate a batch of team names using our word combination system"""
     print("API endpoint called: /api/generate-batch")
     # Add a timestamp to ensure we get a fresh response
-    import time
     current_time = time.time()
     print(f"Request time: {current_time}")
     
@@ -295,7 +514,12 @@ def api_generate_batch():
         existing_name_strings = [name["name"] for name in existing_names]
         
         # Use our new batch generation function from name_generator.py
-        batch_names = generate_batch(count=batch_size, existing_names=existing_name_strings)
+        batch_names = generate_batch(
+            count=batch_size,
+            existing_names=existing_name_strings,
+            is_similar=current_store().is_similar,
+            is_allowed=name_filter.is_allowed
+        )
         
         print(f"Successfully generated {len(batch_names)} team names")
         
@@ -326,11 +550,12 @@ def api_generate_batch():
         })
     except Exception as e:
         print(f"Error generating batch: {str(e)}")
-        import traceback
         traceback.print_exc()
         return jsonify({'success': False, 'error': str(e)}), 500
 
 @app.route('/api/save', methods=['POST'])
+@app.route('/api/w/<workspace_id>/save', methods=['POST'])
+@locks_workspace
 def api_save():
     """API endpoint to save a team name"""
     print("API endpoint called: /api/save")
@@ -344,6 +569,10 @@ def api_save():
                 'error': 'No name data provided'
             }), 400
         
+        name_data['name'], error = name_filter.check_name(name_data.get('name'))
+        if error:
+            return jsonify({'success': False, 'error': error}), 400
+        
         # Load existing names
         names = load_names()
         
@@ -360,6 +589,7 @@ def api_save():
         # Add new name
         names.append(name_data)
         save_names(names)
+        record_usage([name_data])
         
         return jsonify({'success': True, 'updated': False})
     except Exception as e:
@@ -367,6 +597,8 @@ def api_save():
         return jsonify({'success': False, 'error': str(e)}), 500
 
 @app.route('/api/save-shortlist', methods=['POST'])
+@app.route('/api/w/<workspace_id>/save-shortlist', methods=['POST'])
+@locks_workspace
 def api_save_shortlist():
     """API endpoint to save multiple selected team names from a batch"""
     print("API endpoint called: /api/save-shortlist")
@@ -380,51 +612,31 @@ def api_save_shortlist():
                 'error': 'No names provided'
             }), 400
         
-        # Load existing names
-        names = load_names()
-        
-        # Track which names were added vs updated
-        added_count = 0
-        updated_count = 0
-        saved_names = []
-        
-        # Process each selected name
         for selected_name in selected_names:
-            name_id = selected_name.get('id')
-            if not name_id:
-                continue
-                
-            # Check if name already exists
-            found = False
-            for i, existing_name in enumerate(names):
-                if existing_name.get('id') == name_id:
-                    # Update existing name
-                    names[i] = selected_name
-                    updated_count += 1
-                    saved_names.append(selected_name)
-                    found = True
-                    break
-            
-            # Add new name if not found
-            if not found:
-                names.append(selected_name)
-                added_count += 1
-                saved_names.append(selected_name)
+            selected_name['name'], error = name_filter.check_name(selected_name.get('name'))
+            if error:
+                return jsonify({
+                    'success': False,
+                    'error': f"{selected_name['name']}: {error}"
+                }), 400
         
-        # Save updated names list
-        save_names(names)
+        # Upsert through the store's ID index and save once
+        result = current_store().upsert(selected_names)
+        record_usage(result['added_names'])
         
         return jsonify({
             'success': True, 
-            'added': added_count, 
-            'updated': updated_count,
-            'saved_names': saved_names
+            'added': result['added'], 
+            'updated': result['updated'],
+            'saved_names': result['saved_names']
         })
     except Exception as e:
         print(f"Error saving shortlist: {str(e)}")
         return jsonify({'success': False, 'error': str(e)}), 500
 
 @app.route('/api/vote', methods=['POST'])
+@app.route('/api/w/<workspace_id>/vote', methods=['POST'])
+@locks_workspace
 def api_vote():
     data = request.json
     name_id = data.get('id')
@@ -432,28 +644,20 @@ def api_vote():
     if not name_id:
         return jsonify({"success": False, "error": "No ID provided"}), 400
     
-    # Initialize user votes in session if needed
-    if 'voted_names' not in session:
-        session['voted_names'] = []
+    session_id = current_session_id()
     
     names = load_names()
     
     for name in names:
         if name['id'] == name_id:
-            # Check if user has already voted for this name
-            if name_id in session['voted_names']:
-                # Remove vote
-                session['voted_names'].remove(name_id)
-                name['votes'] = max(0, name['votes'] - 1)
-                user_voted = False
-            else:
-                # Add vote
-                session['voted_names'].append(name_id)
+            # Add the user's vote, or remove it if they had already voted
+            user_voted = VOTE_STORE.toggle_vote(session_id, name_id)
+            if user_voted:
                 name['votes'] = name['votes'] + 1
-                user_voted = True
+            else:
+                name['votes'] = max(0, name['votes'] - 1)
             
             # Save changes
-            session.modified = True
             save_names(names)
             
             return jsonify({
@@ -465,6 +669,8 @@ def api_vote():
     return jsonify({"success": False, "error": "Name not found"}), 404
 
 @app.route('/api/add-custom-name', methods=['POST'])
+@app.route('/api/w/<workspace_id>/add-custom-name', methods=['POST'])
+@locks_workspace
 def api_add_custom_name():
     """API endpoint to add a custom team name"""
     print("API endpoint called: /api/add-custom-name")
@@ -473,12 +679,26 @@ def api_add_custom_name():
     if not data.get('name'):
         return jsonify({"success": False, "error": "Name is required"}), 400
     
+    # Normalize the name and check it against the length policy and blocklist
+    custom_name, error = name_filter.check_name(data.get('name'))
+    if error:
+        return jsonify({"success": False, "error": error}), 400
+    
+    # Warn about near-duplicates ("RoboFalcons" vs "Robo Falcons") unless confirmed
+    similar_names = current_store().find_similar(custom_name)
+    if similar_names and not data.get('allow_similar'):
+        return jsonify({
+            "success": False,
+            "warning": "This name is very similar to names already on the list.",
+            "similar_names": similar_names
+        }), 409
+    
     names = load_names()
     
     # Create new custom name entry
     new_name = {
         "id": str(uuid.uuid4()),
-        "name": data.get('name'),
+        "name": custom_name,
         "description": data.get('description', "A custom team name created by our team!"),
         "votes": 0,
         "source": "user",
@@ -487,24 +707,76 @@ def api_add_custom_name():
     
     names.append(new_name)
     save_names(names)
+    record_usage([new_name])
     
     return jsonify({"success": True, "name": new_name})
 
 @app.route('/api/names', methods=['GET'])
+@app.route('/api/w/<workspace_id>/names', methods=['GET'])
 def api_get_names():
     names = load_names()
     
-    # Initialize user votes in session if needed
-    if 'voted_names' not in session:
-        session['voted_names'] = []
+    # Look up the user's votes once, then check each name against the set
+    voted_names = VOTE_STORE.get_votes(current_session_id())
     
     # Add user_voted flag to each name
     for name in names:
-        name['user_voted'] = name['id'] in session['voted_names']
+        name['user_voted'] = name['id'] in voted_names
     
     return jsonify(names)
 
+@app.route('/api/names/export', methods=['GET'])
+@app.route('/api/w/<workspace_id>/names/export', methods=['GET'])
+def api_export_names():
+    """API endpoint to stream all saved names as JSONL or CSV"""
+    fmt = request.args.get('format', 'jsonl').lower()
+    if fmt not in name_transfer.FORMATS:
+        return jsonify({"success": False, "error": f"Unsupported format: {fmt}"}), 400
+    
+    store = current_store()
+    lines = name_transfer.iter_export(store.iter_names(), fmt)
+    
+    response = Response(stream_with_context(lines), mimetype=name_transfer.MIME_TYPES[fmt])
+    response.headers['Content-Disposition'] = f'attachment; filename="names-{store.workspace_id}.{fmt}"'
+    return response
+
+@app.route('/api/names/import', methods=['POST'])
+@app.route('/api/w/<workspace_id>/names/import', methods=['POST'])
+def api_import_names():
+    """API endpoint to upsert names from an uploaded JSONL or CSV stream"""
+    print("API endpoint called: /api/names/import")
+    try:
+        upload = request.files.get('file')
+        if upload:
+            stream = upload.stream
+            default_format = name_transfer.guess_format(upload.filename)
+        else:
+            stream = request.stream
+            default_format = 'csv' if request.mimetype == 'text/csv' else 'jsonl'
+        
+        fmt = request.args.get('format', default_format).lower()
+        if fmt not in name_transfer.FORMATS:
+            return jsonify({"success": False, "error": f"Unsupported format: {fmt}"}), 400
+        
+        # Decode the body line by line instead of reading it all into memory
+        lines = io.TextIOWrapper(stream, encoding='utf-8', newline='')
+        result = name_transfer.import_names(current_store(), lines, fmt)
+        record_usage(result['added_names'])
+        
+        return jsonify({
+            'success': True,
+            'added': result['added'],
+            'updated': result['updated'],
+            'skipped': result['skipped'],
+            'errors': result['errors'][:50]  # Keep the response small
+        })
+    except Exception as e:
+        print(f"Error importing names: {str(e)}")
+        return jsonify({'success': False, 'error': str(e)}), 500
+
 @app.route('/api/remove-zero-votes', methods=['POST'])
+@app.route('/api/w/<workspace_id>/remove-zero-votes', methods=['POST'])
+@locks_workspace
 def remove_zero_votes():
     try:
         # Load current names
@@ -538,6 +810,8 @@ def remove_zero_votes():
         }), 500
 
 @app.route('/api/remove-all-names', methods=['POST'])
+@app.route('/api/w/<workspace_id>/remove-all-names', methods=['POST'])
+@locks_workspace
 def remove_all_names():
     try:
         # Load current names to get count
@@ -563,4 +837,4 @@ def remove_all_names():
         }), 500
 
 if __name__ == '__main__':
-    app.run(debug=True)
+    create_app().run(debug=True)
@@ -0,0 +1,226 @@
+"""FLL Team Name Generator - Bulk Generation CLI
+
+Generates large numbers of team names from the command line, outside the
+50-per-batch limit of the web app. Work is split into chunks that run across a
+process pool; every chunk gets its own random stream derived from the seed, so
+a seeded run produces the same names whatever the number of workers. The parent
+process merges chunks in order, de-duplicates them (within the run and against
+an optional file of existing names) and streams the results to JSONL or CSV.
+Like the web app, a duplicate gets a number added ("Cyber Squad 42") before it is
+given up on, which is what lets runs go well past the number of distinct word
+combinations.
+
+Memory stays bounded: only a few chunks are in flight at once and duplicates are
+tracked by 64-bit hashes rather than full names.
+
+    python bulk_generate.py --count 100000 -o names.jsonl
+    python bulk_generate.py --count 5000 --patterns adjective_animal prefix_animal \\
+        --seed 42 --exclude data/names.json -o animals.csv
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import random
+import sys
+import time
+from collections import deque
+from multiprocessing import Pool
+
+import name_filter
+import name_generator
+import name_transfer
+
+# Constants
+DEFAULT_CHUNK_SIZE = 2000  # Names per pool task
+BATCH_SIZE = 200  # Names per generate_batch() call inside a chunk
+IN_FLIGHT_PER_WORKER = 2  # Chunks queued per worker before waiting on results
+MAX_STALE_CHUNKS = 10  # Stop after this many chunks in a row add no new names
+NUMBER_ATTEMPTS = 5  # Numbered variants to try for a duplicate before dropping it
+
+
+def name_hash(name):
+    """64-bit hash of a lowercased name, used to track duplicates compactly"""
+    return int.from_bytes(hashlib.blake2b(name.lower().encode('utf-8'), digest_size=8).digest(), 'big')
+
+
+def _generate_chunk(task):
+    """
+    Generate one chunk of names in a worker process.
+
+    Args:
+        task (tuple): (chunk index, number of names, pattern names, base seed)
+
+    Returns:
+        list: Generated name dictionaries
+    """
+    chunk_index, size, patterns, seed = task
+
+    # Independent, reproducible stream per chunk
+    random.seed(f"{seed}:{chunk_index}")
+    name_generator.reset_usage()
+
+    names = []
+    chunk_names = []
+    while len(names) < size:
+        batch = name_generator.generate_batch(
+            count=min(BATCH_SIZE, size - len(names)),
+            existing_names=chunk_names,
+            patterns=patterns,
+            is_allowed=name_filter.is_allowed
+        )
+        names.extend(batch)
+        chunk_names.extend(name_data["name"] for name_data in batch)
+    return names
+
+
+def iter_existing_names(path):
+    """
+    Read the names to exclude from a file.
+
+    Supports the app's names.json (a JSON list), JSONL, CSV with a "name"
+    column, or plain text with one name per line.
+
+    Yields:
+        str: Each existing name
+    """
+    if path.lower().endswith('.json'):
+        with open(path, 'r', encoding='utf-8') as f:
+            for item in json.load(f):
+                name = item.get("name") if isinstance(item, dict) else item
+                if name:
+                    yield name
+        return
+
+    with open(path, 'r', newline='', encoding='utf-8') as f:
+        if path.lower().endswith(('.jsonl', '.csv')):
+            for record in name_transfer.iter_import(f, name_transfer.guess_format(path)):
+                yield record["name"]
+        else:
+            for line in f:
+                if line.strip():
+                    yield line.strip()
+
+
+def iter_unique_names(count, patterns=None, seed=None, workers=None, chunk_size=DEFAULT_CHUNK_SIZE, seen=None):
+    """
+    Generate names across a process pool and yield the unique ones in order.
+
+    Args:
+        count (int): Number of unique names wanted
+        patterns (list, optional): Name pattern names to use; defaults to all
+        seed (int, optional): Base seed; a random one is used if omitted
+        workers (int, optional): Pool size; defaults to the number of CPUs
+        chunk_size (int): Names generated per pool task
+        seen (set, optional): Hashes (see name_hash) of names to exclude;
+            updated in place
+
+    Yields:
+        dict: Each unique generated name
+    """
+    # Fail fast on bad pattern names rather than inside a worker
+    name_generator.generate_candidates(0, patterns)
+
+    seed = seed if seed is not None else random.SystemRandom().getrandbits(64)
+    workers = workers or os.cpu_count() or 1
+    seen = seen if seen is not None else set()
+    merge_rng = random.Random(seed)
+
+    produced = 0
+    stale_chunks = 0
+    next_chunk = 0
+    pending = deque()
+
+    with Pool(processes=workers) as pool:
+        while produced < count:
+            # Keep a bounded number of chunks queued, merged in submission order
+            while len(pending) < workers * IN_FLIGHT_PER_WORKER:
+                task = (next_chunk, chunk_size, patterns, seed)
+                pending.append(pool.apply_async(_generate_chunk, (task,)))
+                next_chunk += 1
+
+            added = 0
+            for name_data in pending.popleft().get():
+                name = name_data["name"]
+                key = name_hash(name)
+                for _ in range(NUMBER_ATTEMPTS):
+                    if key not in seen:
+                        break
+                    name = f"{name_data['name']} {merge_rng.randint(1, 99)}"
+                    key = name_hash(name)
+                if key in seen:
+                    continue
+                seen.add(key)
+                name_data["name"] = name
+                added += 1
+                produced += 1
+                yield name_data
+                if produced >= count:
+                    break
+
+            stale_chunks = 0 if added else stale_chunks + 1
+            if stale_chunks >= MAX_STALE_CHUNKS:
+                print(f"Stopping early: the word lists ran out of new names after {produced}", file=sys.stderr)
+                break
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Generate FLL team names in bulk")
+    parser.add_argument('-n', '--count', type=int, required=True, help="Number of unique names to generate")
+    parser.add_argument('-o', '--output', help="Output file (default: stdout)")
+    parser.add_argument('-f', '--format', choices=name_transfer.FORMATS,
+                        help="jsonl or csv (default: from file extension)")
+    parser.add_argument('-p', '--patterns', nargs='+', choices=list(name_generator.load_patterns()),
+                        help="Name patterns to use (default: all)")
+    parser.add_argument('-s', '--seed', type=int, help="Seed for reproducible output")
+    parser.add_argument('-x', '--exclude', help="File of existing names to skip (names.json, JSONL, CSV or text)")
+    parser.add_argument('-w', '--workers', type=int, help="Worker processes (default: number of CPUs)")
+    parser.add_argument('--chunk-size', type=int, default=DEFAULT_CHUNK_SIZE, help="Names per worker task")
+    args = parser.parse_args(argv)
+
+    if args.count < 1:
+        parser.error("--count must be at least 1")
+    if args.chunk_size < 1:
+        parser.error("--chunk-size must be at least 1")
+
+    seen = set()
+    if args.exclude:
+        seen.update(name_hash(name) for name in iter_existing_names(args.exclude))
+        print(f"Excluding {len(seen)} existing names", file=sys.stderr)
+
+    fmt = args.format or name_transfer.guess_format(args.output)
+    out = open(args.output, 'w', newline='', encoding='utf-8') if args.output else sys.stdout
+
+    start = time.perf_counter()
+    written = 0
+
+    def counted(names):
+        nonlocal written
+        for name_data in names:
+            written += 1
+            yield name_data
+
+    try:
+        names = iter_unique_names(
+            args.count,
+            patterns=args.patterns,
+            seed=args.seed,
+            workers=args.workers,
+            chunk_size=args.chunk_size,
+            seen=seen
+        )
+        for line in name_transfer.iter_export(counted(names), fmt):
+            out.write(line)
+    finally:
+        if args.output:
+            out.close()
+
+    elapsed = time.perf_counter() - start
+    print(f"Wrote {written} names in {elapsed:.2f}s ({written / elapsed if elapsed else 0:.0f} names/s)",
+          file=sys.stderr)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,332 @@
+"""FLL Team Name Generator - Lexicon Snapshot Module
+
+A flat binary snapshot of word_components.json and its compatibility index,
+so that worker processes don't each scan the word lists to work out which
+words go together when they compile the name patterns.
+
+The snapshot is memory-mapped read-only and the index is read from the mapping
+while the patterns compile. The word lists themselves are still built as
+Python objects in every worker (LexiconSnapshot.components() is no faster than
+json.load), so the saving is the index build, not memory.
+
+The header carries the SHA-256 of the JSON it was built from; if the JSON has
+changed, or the format version or byte order differ, the snapshot is rebuilt
+automatically.
+
+Layout (all integers are native uint32, every section is 4-byte aligned):
+
+    header      magic, version, byte order mark, source SHA-256, section table
+    strings     utf-8 blob + offsets table
+    types       (type name, first word, word count) per word list
+    words       (word, category, first tag, tag count) per word
+    tags        tag string IDs
+    buckets     (key string, first posting, posting count), sorted by key
+    postings    word positions within their list
+    extras      JSON of everything that isn't a word list (templates, patterns)
+
+A bucket key is "<word type>|<sorted tags joined by commas>" and lists the words
+of that type sharing at least one of the tags, like find_compatible_words().
+Buckets are built for every tag set used by a word in the lexicon.
+
+    python lexicon_snapshot.py          # build data/word_components.snapshot
+"""
+
+import hashlib
+import json
+import mmap
+import os
+import struct
+import sys
+import tempfile
+from array import array
+
+# Constants
+DATA_DIR = os.path.join(os.path.dirname(__file__), 'data')
+COMPONENTS_FILE = os.path.join(DATA_DIR, 'word_components.json')
+SNAPSHOT_FILE = os.path.join(DATA_DIR, 'word_components.snapshot')
+MAGIC = b'FLLLEX\x00\x00'
+VERSION = 1
+BYTE_ORDER_MARK = 0x01020304
+NO_STRING = 0xFFFFFFFF
+WORD_FIELDS = {'word', 'category', 'compatibility'}
+SECTIONS = ('string_data', 'string_offsets', 'types', 'words', 'tags', 'buckets', 'postings', 'extras')
+
+_HEADER = struct.Struct('=8sII32s' + 'II' * len(SECTIONS))
+_BUCKET_SIZE = 12  # Bytes per bucket record
+
+
+class SnapshotError(Exception):
+    """Raised when a snapshot file is missing, corrupt or stale."""
+    pass
+
+
+def source_checksum(source=COMPONENTS_FILE):
+    """SHA-256 of the word components file"""
+    with open(source, 'rb') as f:
+        return hashlib.sha256(f.read()).digest()
+
+
+def bucket_key(word_type, compatibility=None):
+    """Key of the compatibility bucket for a word type and a set of tags"""
+    return f"{word_type}|{','.join(sorted(compatibility or ()))}"
+
+
+def _is_word_list(value):
+    return (isinstance(value, list) and value and
+            all(isinstance(item, dict) and 'word' in item and set(item) <= WORD_FIELDS for item in value))
+
+
+def build_snapshot(source=COMPONENTS_FILE, path=SNAPSHOT_FILE):
+    """
+    Serialize the word components and their compatibility index.
+
+    The file is written to a temporary name and moved into place, so workers
+    reading the old snapshot are never disturbed.
+
+    Args:
+        source (str): Path of word_components.json
+        path (str): Where to write the snapshot
+
+    Returns:
+        str: The snapshot path
+
+    Raises:
+        OSError: If the source can't be read or the snapshot can't be written
+        ValueError: If the source isn't valid JSON
+    """
+    with open(source, 'rb') as f:
+        raw = f.read()
+    components = json.loads(raw)
+
+    strings = []
+    string_ids = {}
+
+    def string_id(text):
+        if text not in string_ids:
+            string_ids[text] = len(strings)
+            strings.append(text)
+        return string_ids[text]
+
+    word_lists = {key: value for key, value in components.items() if _is_word_list(value)}
+    extras = {key: value for key, value in components.items() if key not in word_lists}
+
+    types = array('I')
+    words = array('I')
+    tags = array('I')
+    for word_type, word_list in word_lists.items():
+        types.extend((string_id(word_type), len(words) // 4, len(word_list)))
+        for word in word_list:
+            category = word.get('category')
+            words.extend((
+                string_id(word['word']),
+                NO_STRING if category is None else string_id(category),
+                len(tags),
+                len(word.get('compatibility', ()))
+            ))
+            tags.extend(string_id(tag) for tag in word.get('compatibility', ()))
+
+    # One bucket per word type for every tag set in use, plus the whole list
+    tag_sets = {tuple(sorted(word.get('compatibility', ())))
+                for word_list in word_lists.values() for word in word_list}
+    tag_sets.add(())
+    buckets = []
+    for word_type, word_list in word_lists.items():
+        for tag_set in tag_sets:
+            if tag_set:
+                wanted = set(tag_set)
+                positions = [i for i, word in enumerate(word_list)
+                             if not wanted.isdisjoint(word.get('compatibility', ()))]
+            else:
+                positions = list(range(len(word_list)))
+            buckets.append((bucket_key(word_type, tag_set), positions))
+    buckets.sort()
+
+    bucket_table = array('I')
+    postings = array('I')
+    for key, positions in buckets:
+        bucket_table.extend((string_id(key), len(postings), len(positions)))
+        postings.extend(positions)
+
+    string_offsets = array('I', [0])
+    string_data = bytearray()
+    for text in strings:
+        string_data += text.encode('utf-8')
+        string_offsets.append(len(string_data))
+
+    sections = {
+        'string_data': bytes(string_data),
+        'string_offsets': string_offsets.tobytes(),
+        'types': types.tobytes(),
+        'words': words.tobytes(),
+        'tags': tags.tobytes(),
+        'buckets': bucket_table.tobytes(),
+        'postings': postings.tobytes(),
+        'extras': json.dumps(extras).encode('utf-8')
+    }
+
+    body = bytearray()
+    table = []
+    offset = _HEADER.size
+    for name in SECTIONS:
+        padding = -offset % 4
+        body += b'\0' * padding
+        offset += padding
+        table.extend((offset, len(sections[name])))
+        body += sections[name]
+        offset += len(sections[name])
+
+    header = _HEADER.pack(MAGIC, VERSION, BYTE_ORDER_MARK, hashlib.sha256(raw).digest(), *table)
+
+    directory = os.path.dirname(path) or '.'
+    fd, temp_path = tempfile.mkstemp(dir=directory, prefix='.snapshot-')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(header)
+            f.write(body)
+        os.chmod(temp_path, 0o644)
+        os.replace(temp_path, path)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+    return path
+
+
+class LexiconSnapshot:
+    """Read-only view of a memory-mapped snapshot."""
+
+    def __init__(self, path=SNAPSHOT_FILE, checksum=None):
+        """
+        Map a snapshot file.
+
+        Args:
+            path (str): The snapshot file
+            checksum (bytes, optional): Expected source SHA-256; a mismatch
+                means the snapshot is stale
+
+        Raises:
+            SnapshotError: If the file is missing, corrupt or stale
+        """
+        self.path = path
+        try:
+            with open(path, 'rb') as f:
+                self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError) as e:
+            raise SnapshotError(f"Can't open lexicon snapshot: {str(e)}")
+
+        if len(self._mmap) < _HEADER.size:
+            raise SnapshotError("Lexicon snapshot is truncated")
+        magic, version, byte_order, self.checksum, *table = _HEADER.unpack_from(self._mmap)
+        if magic != MAGIC or version != VERSION or byte_order != BYTE_ORDER_MARK:
+            raise SnapshotError("Lexicon snapshot was written by another version or platform")
+        if checksum is not None and checksum != self.checksum:
+            raise SnapshotError("Lexicon snapshot is out of date")
+
+        view = memoryview(self._mmap)
+        self.bucket_count = table[2 * SECTIONS.index('buckets') + 1] // _BUCKET_SIZE
+        self._sections = {}
+        for i, name in enumerate(SECTIONS):
+            offset, length = table[2 * i], table[2 * i + 1]
+            if offset + length > len(self._mmap):
+                raise SnapshotError("Lexicon snapshot is truncated")
+            section = view[offset:offset + length]
+            self._sections[name] = section if name in ('string_data', 'extras') else section.cast('I')
+
+    def string(self, string_id):
+        """Decode one string from the string table"""
+        offsets = self._sections['string_offsets']
+        return str(self._sections['string_data'][offsets[string_id]:offsets[string_id + 1]], 'utf-8')
+
+    def components(self):
+        """
+        Build the word components dictionary, as json.load() would.
+
+        Returns:
+            dict: Word lists plus templates, patterns and any other keys
+        """
+        strings = {}
+
+        def string(string_id):
+            if string_id not in strings:
+                strings[string_id] = self.string(string_id)
+            return strings[string_id]
+
+        types, words, tags = self._sections['types'], self._sections['words'], self._sections['tags']
+        components = {}
+        for i in range(0, len(types), 3):
+            word_list = []
+            for w in range(types[i + 1], types[i + 1] + types[i + 2]):
+                word_id, category_id, tag_start, tag_count = words[4 * w:4 * w + 4]
+                word = {"word": string(word_id)}
+                if category_id != NO_STRING:
+                    word["category"] = string(category_id)
+                word["compatibility"] = [string(tag) for tag in tags[tag_start:tag_start + tag_count]]
+                word_list.append(word)
+            components[string(types[i])] = word_list
+
+        components.update(json.loads(str(self._sections['extras'], 'utf-8')))
+        return components
+
+    def bucket(self, word_type, compatibility=None):
+        """
+        Look up the precomputed positions of the words compatible with a tag set.
+
+        Args:
+            word_type (str): The word list (prefixes, suffixes, etc.)
+            compatibility (list, optional): Tags at least one of which must match
+
+        Returns:
+            memoryview: Positions within the word list, or None if the tag set
+                isn't in the index
+        """
+        key = bucket_key(word_type, compatibility)
+        buckets = self._sections['buckets']
+
+        # Binary search over the sorted bucket keys
+        low, high = 0, self.bucket_count
+        while low < high:
+            middle = (low + high) // 2
+            if self.string(buckets[3 * middle]) < key:
+                low = middle + 1
+            else:
+                high = middle
+        if low < self.bucket_count and self.string(buckets[3 * low]) == key:
+            start, count = buckets[3 * low + 1], buckets[3 * low + 2]
+            return self._sections['postings'][start:start + count]
+        return None
+
+
+def load_snapshot(source=COMPONENTS_FILE, path=SNAPSHOT_FILE):
+    """
+    Open the snapshot for a word components file, rebuilding it if stale.
+
+    Args:
+        source (str): Path of word_components.json
+        path (str): Snapshot path
+
+    Returns:
+        LexiconSnapshot: The mapped snapshot
+
+    Raises:
+        OSError: If the source can't be read or a new snapshot can't be written
+        ValueError: If the source isn't valid JSON
+    """
+    checksum = source_checksum(source)
+    try:
+        return LexiconSnapshot(path, checksum)
+    except SnapshotError:
+        build_snapshot(source, path)
+        return LexiconSnapshot(path, checksum)
+
+
+def main():
+    source = sys.argv[1] if len(sys.argv) > 1 else COMPONENTS_FILE
+    path = sys.argv[2] if len(sys.argv) > 2 else SNAPSHOT_FILE
+    build_snapshot(source, path)
+    snapshot = LexiconSnapshot(path)
+    print(f"Wrote {path} ({os.path.getsize(path)} bytes, {snapshot.bucket_count} buckets)")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,245 @@
+"""FLL Team Name Generator - Name Filter Module
+
+Input pipeline applied to every generated and submitted team name:
+
+1. Unicode normalization (NFKC) and removal of control characters
+2. Whitespace canonicalization (trimmed, single spaces)
+3. A length policy
+4. A blocklist check against data/blocklist.txt
+
+The blocklist is compiled into an Aho-Corasick automaton, so a name is checked
+against every banned term in one linear pass however long the list is. Terms
+match whole words only ("ass" blocks "Ass Kickers" but not "Assemblers"), after
+case folding and undoing common letter swaps like "0" for "o" in words that
+also contain letters (so team numbers like "455" are left alone). When the file
+changes, the automaton is rebuilt on a background thread while the old one
+keeps serving.
+"""
+
+import os
+import re
+import threading
+import time
+import unicodedata
+from collections import deque
+
+# Constants
+BLOCKLIST_FILE = os.path.join(os.path.dirname(__file__), 'data', 'blocklist.txt')
+MIN_NAME_LENGTH = 2
+MAX_NAME_LENGTH = 40
+BLOCKLIST_CHECK_INTERVAL = 5  # Seconds between blocklist file change checks
+
+_WHITESPACE = re.compile(r'\s+')
+_TOKEN = re.compile(r'\S+')
+_CONTROL_CHARS = re.compile(r'[\x00-\x1f\x7f-\x9f\u200b-\u200f\u202a-\u202e\u2060\ufeff]')
+_LOOKALIKES = str.maketrans({
+    '0': 'o', '1': 'i', '3': 'e', '4': 'a', '5': 's', '7': 't', '@': 'a', '$': 's', '!': 'i'
+})
+
+
+def normalize_name(name):
+    """
+    Canonicalize a name for storage and display.
+
+    Args:
+        name (str): Raw name text
+
+    Returns:
+        str: NFKC-normalized name with control characters removed and
+            whitespace collapsed to single spaces
+    """
+    if not name:
+        return ''
+    name = unicodedata.normalize('NFKC', name)
+    name = _CONTROL_CHARS.sub('', name)
+    return _WHITESPACE.sub(' ', name).strip()
+
+
+def _fold_lookalikes(match):
+    token = match.group()
+    # "5h1t" is disguised text; "455" is a team number and stays as it is
+    if any(char.isalpha() for char in token):
+        return token.translate(_LOOKALIKES)
+    return token
+
+
+def match_key(name):
+    """Case-folded, look-alike-free form of a name used for blocklist matching"""
+    return _TOKEN.sub(_fold_lookalikes, normalize_name(name).casefold())
+
+
+class AhoCorasick:
+    """Aho-Corasick automaton for finding many terms in one pass over a text."""
+
+    def __init__(self, terms):
+        self._goto = [{}]  # node -> {char: next node}
+        self._fail = [0]  # node -> longest proper suffix node
+        self._output = [()]  # node -> terms ending here
+        self.size = 0
+
+        for term in terms:
+            if term:
+                self._add(term)
+                self.size += 1
+        self._link()
+
+    def _add(self, term):
+        node = 0
+        for char in term:
+            next_node = self._goto[node].get(char)
+            if next_node is None:
+                next_node = len(self._goto)
+                self._goto[node][char] = next_node
+                self._goto.append({})
+                self._fail.append(0)
+                self._output.append(())
+            node = next_node
+        self._output[node] = self._output[node] + (term,)
+
+    def _link(self):
+        # Breadth-first so every node's fail link is ready before its children
+        queue = deque(self._goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for char, child in self._goto[node].items():
+                queue.append(child)
+                fail = self._fail[node]
+                while fail and char not in self._goto[fail]:
+                    fail = self._fail[fail]
+                self._fail[child] = self._goto[fail].get(char, 0)
+                self._output[child] = self._output[child] + self._output[self._fail[child]]
+
+    def find_all(self, text):
+        """
+        Find every occurrence of every term.
+
+        Args:
+            text (str): Text to search
+
+        Yields:
+            tuple: (start index, term) for each match
+        """
+        node = 0
+        for i, char in enumerate(text):
+            while node and char not in self._goto[node]:
+                node = self._fail[node]
+            node = self._goto[node].get(char, 0)
+            for term in self._output[node]:
+                yield i - len(term) + 1, term
+
+
+def _is_word_boundary(text, index):
+    return index < 0 or index >= len(text) or not text[index].isalnum()
+
+
+class Blocklist:
+    """Banned terms loaded from a file, rebuilt in the background when it changes."""
+
+    def __init__(self, path=BLOCKLIST_FILE):
+        self.path = path
+        self._automaton = AhoCorasick([])
+        self._mtime = None
+        self._last_check = 0.0
+        self._rebuilding = False
+        self._lock = threading.Lock()
+        self._rebuild()
+
+    def _read_terms(self):
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                lines = f.read().splitlines()
+        except FileNotFoundError:
+            return []
+        return [match_key(line) for line in lines if line.strip() and not line.lstrip().startswith('#')]
+
+    def _rebuild(self):
+        try:
+            mtime = os.path.getmtime(self.path)
+        except OSError:
+            mtime = None
+        try:
+            automaton = AhoCorasick(self._read_terms())
+            self._automaton = automaton
+            self._mtime = mtime
+            print(f"Loaded blocklist with {automaton.size} terms")
+        except Exception as e:
+            print(f"Error loading blocklist: {str(e)}")
+        finally:
+            self._rebuilding = False
+
+    def _refresh(self):
+        """Start a background rebuild if the file changed since the last build"""
+        now = time.monotonic()
+        if now - self._last_check < BLOCKLIST_CHECK_INTERVAL:
+            return
+        with self._lock:
+            if self._rebuilding or now - self._last_check < BLOCKLIST_CHECK_INTERVAL:
+                return
+            self._last_check = now
+            try:
+                mtime = os.path.getmtime(self.path)
+            except OSError:
+                mtime = None
+            if mtime == self._mtime:
+                return
+            self._rebuilding = True
+        threading.Thread(target=self._rebuild, name="blocklist-rebuild", daemon=True).start()
+
+    def find(self, name):
+        """
+        Find banned terms used as whole words in a name.
+
+        Args:
+            name (str): The name to check
+
+        Returns:
+            list: The banned terms found, in order of appearance
+        """
+        self._refresh()
+        text = match_key(name)
+        found = []
+        for start, term in self._automaton.find_all(text):
+            if _is_word_boundary(text, start - 1) and _is_word_boundary(text, start + len(term)):
+                found.append(term)
+        return found
+
+
+# Shared blocklist, created on first use
+_blocklist = None
+_blocklist_lock = threading.Lock()
+
+
+def get_blocklist():
+    """Get the shared blocklist, loading it on first use"""
+    global _blocklist
+
+    if _blocklist is None:
+        with _blocklist_lock:
+            if _blocklist is None:
+                _blocklist = Blocklist()
+    return _blocklist
+
+
+def check_name(name):
+    """
+    Run a name through the full input pipeline.
+
+    Args:
+        name (str): Raw name text
+
+    Returns:
+        tuple: (normalized name, error message or None if the name is acceptable)
+    """
+    cleaned = normalize_name(name)
+    if len(cleaned) < MIN_NAME_LENGTH:
+        return cleaned, f"Team names need at least {MIN_NAME_LENGTH} characters"
+    if len(cleaned) > MAX_NAME_LENGTH:
+        return cleaned, f"Team names can be at most {MAX_NAME_LENGTH} characters"
+    if get_blocklist().find(cleaned):
+        return cleaned, "Please choose a friendlier team name"
+    return cleaned, None
+
+
+def is_allowed(name):
+    """Check whether a name passes the input pipeline"""
+    return check_name(name)[1] is None
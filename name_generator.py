@@ -5,17 +5,76 @@ from the word_components.json file. It replaces the previous prompt engineering
 approach with a deterministic but random word combination system.
 """
 
+import heapq
 import json
 import os
 import random
+import re
+import threading
+import time
+import uuid
+from collections import Counter
 from datetime import datetime
 
+from lexicon_snapshot import load_snapshot
+from name_similarity import compact_key
+from weighted_sampling import AliasTable
+
 # Constants
 COMPONENTS_FILE = os.path.join(os.path.dirname(__file__), 'data', 'word_components.json')
+SNAPSHOT_FILE = os.path.join(os.path.dirname(__file__), 'data', 'word_components.snapshot')
+
+# Ranking stage settings - every feature scores between 0 and 1
+RANK_OVERSAMPLE = 4  # Candidates generated per requested name
+IDEAL_NAME_LENGTH = 13  # Characters, including the space
+SCORE_WEIGHTS = {
+    "tag_overlap": 0.35,
+    "category_fit": 0.2,
+    "alliteration": 0.1,
+    "length": 0.15,
+    "novelty": 0.2
+}
+
+# Usage-aware sampling settings
+USAGE_PENALTY = 0.5  # Weight of a word is 1 / (1 + USAGE_PENALTY * uses)
+USAGE_HALF_LIFE = 500  # Halve all usage counts after this many recorded names
+
+# Name patterns used when word_components.json doesn't define "patterns"
+DEFAULT_PATTERNS = [
+    {"name": "prefix_suffix", "rule": "prefix ~suffix"},
+    {"name": "prefix_noun", "rule": "prefix ~noun"},
+    {"name": "adjective_animal", "rule": "adjective ~animal"},
+    {"name": "prefix_animal", "rule": "prefix ~animal"}
+]
+MAX_REPEAT_RESAMPLES = 3  # Redraws when a pattern picks the same word twice
+MAX_DESCRIPTION_ATTEMPTS = 5  # Template picks before collapsing a repeated word
+MAX_NUMBERED_ATTEMPTS = 10  # Numbered names tried per missing batch slot
+
+# A word repeated back to back in a description ("the Swift Swift Falcons")
+_REPEATED_WORD = re.compile(r"\b(\w+)\s+\1\b", re.IGNORECASE)
 
 # Cache for word components
 _word_components = None
 
+# Memory-mapped snapshot the word components were loaded from, if any
+_lexicon_snapshot = None
+
+# Compiled name patterns, built once per lexicon load
+_patterns = None
+
+# Multi-word lexicon entries for usage counting, built once per lexicon load
+_lexicon_phrases = None
+
+# Usage-weighted samplers, one per (word type, compatibility tags) bucket
+_usage_counts = Counter()  # lowercase word -> times used
+_usage_recorded = 0  # names recorded since the last halving
+_buckets = {}  # (word type, tags) -> _WordBucket
+_word_buckets = {}  # lowercase word -> set of bucket keys containing it
+_sampling_lock = threading.Lock()
+
+# Per-word scoring features, computed once per word (keyed by id of the word dict)
+_word_features = {}
+
 def load_word_components():
     """
     Load word components from the JSON file.
@@ -23,12 +82,18 @@ def load_word_components():
     Returns:
         dict: The word components dictionary
     """
-    global _word_components
+    global _word_components, _lexicon_snapshot, _patterns, _lexicon_phrases
     
     if _word_components is None:
+        _lexicon_snapshot = None
+        _patterns = None
+        _lexicon_phrases = None
+        _word_features.clear()
+        with _sampling_lock:
+            _buckets.clear()
+            _word_buckets.clear()
         try:
-            with open(COMPONENTS_FILE, 'r') as f:
-                _word_components = json.load(f)
+            _word_components, _lexicon_snapshot = _read_word_components()
         except (FileNotFoundError, json.JSONDecodeError) as e:
             print(f"Error loading word components: {str(e)}")
             # Provide minimal fallback if file can't be loaded
@@ -43,6 +108,26 @@ def load_word_components():
     
     return _word_components
 
+def _read_word_components():
+    """
+    Read the word components through the shared lexicon snapshot.
+    
+    The snapshot is rebuilt if word_components.json has changed. If it can't be
+    written (e.g. a read-only deployment) the JSON is parsed directly.
+    
+    Returns:
+        tuple: (word components dict, LexiconSnapshot or None)
+    """
+    try:
+        snapshot = load_snapshot(COMPONENTS_FILE, SNAPSHOT_FILE)
+        return snapshot.components(), snapshot
+    except OSError as e:
+        if not os.path.exists(COMPONENTS_FILE):
+            raise
+        print(f"Lexicon snapshot unavailable, reading {COMPONENTS_FILE} directly: {str(e)}")
+        with open(COMPONENTS_FILE, 'r') as f:
+            return json.load(f), None
+
 def find_compatible_words(word_type, compatibility=None):
     """
     Find words from a specific type that match the given compatibility.
@@ -62,154 +147,310 @@ def find_compatible_words(word_type, compatibility=None):
     if not compatibility:
         return components[word_type]
     
+    # The snapshot has precomputed positions for every tag set used in the lexicon
+    if _lexicon_snapshot is not None:
+        positions = _lexicon_snapshot.bucket(word_type, compatibility)
+        if positions is not None:
+            words = components[word_type]
+            return [words[i] for i in positions]
+    
     return [
         word for word in components[word_type]
         if any(tag in word.get("compatibility", []) for tag in compatibility)
     ]
 
-def generate_team_name(existing_names=None):
+class _WordBucket:
+    """Candidate words for one (type, compatibility) combination and their sampler."""
+    
+    __slots__ = ("words", "table", "dirty")
+    
+    def __init__(self, words):
+        self.words = words
+        self.table = None
+        self.dirty = True
+    
+    def sample(self):
+        if self.dirty:
+            with _sampling_lock:
+                if self.dirty:
+                    weights = [1.0 / (1 + USAGE_PENALTY * _usage_counts.get(word["word"].lower(), 0))
+                               for word in self.words]
+                    self.table = AliasTable(weights)
+                    self.dirty = False
+        return self.words[self.table.sample()]
+
+def _get_bucket(word_type, compatibility=None):
+    key = (word_type, tuple(sorted(compatibility or ())))
+    bucket = _buckets.get(key)
+    if bucket is None:
+        words = find_compatible_words(word_type, compatibility) or load_word_components()[word_type]
+        bucket = _WordBucket(words)
+        with _sampling_lock:
+            bucket = _buckets.setdefault(key, bucket)
+            for word in bucket.words:
+                _word_buckets.setdefault(word["word"].lower(), set()).add(key)
+    return bucket
+
+def sample_word(word_type, compatibility=None):
     """
-    Generate a team name using word combinations.
+    Pick a word of the given type, favouring words that haven't been used much.
+    
+    Candidates are resolved once per (word type, compatibility tags) bucket and
+    drawn from an alias table in constant time. If no word matches the tags,
+    any word of the type can be picked.
     
     Args:
-        existing_names (list, optional): List of existing names to avoid duplicates
+        word_type (str): The type of word to pick (prefixes, suffixes, etc.)
+        compatibility (list, optional): Compatibility tags the word must share
         
     Returns:
-        dict: A dictionary with name and description
+        dict: The chosen word component
     """
-    components = load_word_components()
-    existing_names = existing_names or []
+    return _get_bucket(word_type, compatibility).sample()
+
+def reset_usage():
+    """Forget all recorded word usage so every word is equally likely again"""
+    global _usage_recorded
+    
+    with _sampling_lock:
+        _usage_counts.clear()
+        _usage_recorded = 0
+        for bucket in _buckets.values():
+            bucket.dirty = True
+
+def record_usage(names):
+    """
+    Count the words of generated or saved names so sampling steers away from them.
     
-    # Choose a name pattern randomly
-    patterns = [
-        generate_prefix_suffix,
-        generate_prefix_noun,
-        generate_adjective_animal,
-        generate_prefix_animal
-    ]
+    Only the buckets containing a changed word are rebuilt, lazily on their
+    next draw. Counts are halved every USAGE_HALF_LIFE names so old batches
+    stop weighing on new ones.
     
-    # Try up to 10 times to generate a unique name
-    for _ in range(10):
-        generator_func = random.choice(patterns)
-        name_data = generator_func()
+    Args:
+        names (list): Name strings or name dictionaries
+    """
+    global _usage_recorded
+    
+    counts = word_usage_counts(names)
+    if not counts:
+        return
+    
+    with _sampling_lock:
+        _usage_counts.update(counts)
+        _usage_recorded += len(names)
         
-        # Check if name already exists - handle both string and dict formats
-        name_exists = False
-        for existing in existing_names:
-            if isinstance(existing, dict) and existing.get("name"):
-                if name_data["name"].lower() == existing["name"].lower():
-                    name_exists = True
-                    break
-            elif isinstance(existing, str):
-                if name_data["name"].lower() == existing.lower():
-                    name_exists = True
-                    break
+        if _usage_recorded >= USAGE_HALF_LIFE:
+            for word in list(_usage_counts):
+                _usage_counts[word] //= 2
+                if not _usage_counts[word]:
+                    del _usage_counts[word]
+            _usage_recorded = 0
+            dirty_keys = _buckets.keys()
+        else:
+            dirty_keys = set()
+            for word in counts:
+                dirty_keys.update(_word_buckets.get(word, ()))
         
-        if not name_exists:
-            return name_data
-    
-    # If we couldn't generate a unique name, add a random number to make it unique
-    name_data = random.choice(patterns)()
-    name_data["name"] = f"{name_data['name']} {random.randint(1, 99)}"
-    return name_data
+        for key in dirty_keys:
+            _buckets[key].dirty = True
 
-def generate_prefix_suffix():
-    """Generate a team name using prefix + suffix pattern"""
-    components = load_word_components()
-    
-    prefix = random.choice(components["prefixes"])
-    
-    # Find compatible suffixes
-    compatible_suffixes = find_compatible_words("suffixes", prefix.get("compatibility"))
-    if not compatible_suffixes:
-        compatible_suffixes = components["suffixes"]
+class _PatternPlan:
+    """
+    A compiled name pattern.
     
-    suffix = random.choice(compatible_suffixes)
+    Each step is either a free slot, sampled from one bucket covering the whole
+    word type, or a linked slot whose compatible candidates were resolved at
+    compile time for every possible previous word. Sampling a name is therefore
+    one alias-table draw per slot, however large the lexicon is.
+    """
     
-    # Get a random adjective for the description
-    adjective = random.choice(components["adjectives"])
+    __slots__ = ("name", "rule", "weight", "steps", "adjective_slot")
     
-    name = f"{prefix['word']} {suffix['word']}"
-    description = generate_description(prefix, suffix, adjective)
+    def __init__(self, name, rule, weight, steps, adjective_slot):
+        self.name = name
+        self.rule = rule
+        self.weight = weight
+        self.steps = steps  # list of (bucket, None) or (None, {id(previous word): bucket})
+        self.adjective_slot = adjective_slot  # index of an adjective in the name, if any
     
-    return {
-        "name": name,
-        "description": description,
-        "generation_method": "word_combination"
-    }
+    def sample(self):
+        """
+        Pick the words for one name.
+        
+        Returns:
+            tuple: (tuple of word dicts, adjective dict or None)
+        """
+        words = []
+        for bucket, linked in self.steps:
+            if linked is not None:
+                bucket = linked[id(words[-1])]
+            word = bucket.sample()
+            # Avoid names like "Nexus Nexus" when a word appears in two types
+            for _ in range(MAX_REPEAT_RESAMPLES):
+                if all(word["word"] != previous["word"] for previous in words):
+                    break
+                word = bucket.sample()
+            words.append(word)
+        
+        adjective = words[self.adjective_slot] if self.adjective_slot is not None else None
+        return tuple(words), adjective
 
-def generate_prefix_noun():
-    """Generate a team name using prefix + noun pattern"""
-    components = load_word_components()
-    
-    prefix = random.choice(components["prefixes"])
-    
-    # Find compatible nouns
-    compatible_nouns = find_compatible_words("nouns", prefix.get("compatibility"))
-    if not compatible_nouns:
-        compatible_nouns = components["nouns"]
-    
-    noun = random.choice(compatible_nouns)
+def _resolve_word_type(slot, components):
+    """Map a rule slot like "animal" onto a word list key like "animals" """
+    for key in (slot, slot + "s", slot + "es"):
+        if key != "description_templates" and isinstance(components.get(key), list) and components[key]:
+            return key
+    return None
+
+def compile_pattern(pattern, components=None):
+    """
+    Compile one grammar rule into a sampling plan.
     
-    # Get a random adjective for the description
-    adjective = random.choice(components["adjectives"])
+    A rule lists word types separated by spaces, e.g. "adjective ~prefix ~animal".
+    A "~" links a slot to the one before it: its word must share a
+    compatibility tag with the previous word (any word of the type is used if
+    none does). Unlinked slots are picked independently.
     
-    name = f"{prefix['word']} {noun['word']}"
-    description = generate_description(prefix, noun, adjective)
+    Args:
+        pattern (dict): {"name": ..., "rule": ..., "weight": ...} from word_components.json
+        components (dict, optional): The word components; loaded if omitted
+        
+    Returns:
+        _PatternPlan: The compiled plan
+        
+    Raises:
+        ValueError: If the rule is malformed or uses an unknown word type
+    """
+    components = components or load_word_components()
+    rule = pattern.get("rule", "")
+    slots = rule.split()
+    name = pattern.get("name") or "_".join(slot.lstrip("~") for slot in slots)
+    weight = float(pattern.get("weight", 1))
+    
+    if len(slots) < 2:
+        raise ValueError("a rule needs at least two words")
+    if slots[0].startswith("~"):
+        raise ValueError("the first word can't be linked to a previous one")
+    if weight <= 0:
+        raise ValueError("weight must be positive")
+    
+    steps = []
+    word_types = []
+    for slot in slots:
+        word_type = _resolve_word_type(slot.lstrip("~"), components)
+        if word_type is None:
+            raise ValueError(f"unknown word type {slot.lstrip('~')!r}")
+        
+        if slot.startswith("~"):
+            # Pre-resolve the compatible candidates for every possible previous word
+            linked = {
+                id(previous): _get_bucket(word_type, previous.get("compatibility"))
+                for previous in components[word_types[-1]]
+            }
+            steps.append((None, linked))
+        else:
+            steps.append((_get_bucket(word_type), None))
+        word_types.append(word_type)
     
-    return {
-        "name": name,
-        "description": description,
-        "generation_method": "word_combination"
-    }
+    adjective_slot = word_types.index("adjectives") if "adjectives" in word_types else None
+    return _PatternPlan(name, rule, weight, steps, adjective_slot)
 
-def generate_adjective_animal():
-    """Generate a team name using adjective + animal pattern"""
-    components = load_word_components()
-    
-    adjective = random.choice(components["adjectives"])
-    
-    # Find compatible animals
-    compatible_animals = find_compatible_words("animals", adjective.get("compatibility"))
-    if not compatible_animals:
-        compatible_animals = components["animals"]
+def load_patterns():
+    """
+    Compile the name patterns from word_components.json (once per lexicon load).
     
-    animal = random.choice(compatible_animals)
+    Falls back to DEFAULT_PATTERNS if the file doesn't define any. Rules that
+    fail to compile are reported and skipped.
     
-    name = f"{adjective['word']} {animal['word']}"
-    description = generate_description(adjective, animal)
+    Returns:
+        dict: Pattern name -> compiled plan
+    """
+    global _patterns
+    
+    if _patterns is None:
+        components = load_word_components()
+        compiled = {}
+        for pattern in components.get("patterns") or DEFAULT_PATTERNS:
+            try:
+                plan = compile_pattern(pattern, components)
+                compiled[plan.name] = plan
+            except (ValueError, TypeError, AttributeError) as e:
+                print(f"Skipping name pattern {pattern!r}: {str(e)}")
+        
+        if not compiled:
+            compiled = {plan.name: plan for plan in (compile_pattern(p, components) for p in DEFAULT_PATTERNS)}
+        _patterns = compiled
     
-    return {
-        "name": name,
-        "description": description,
-        "generation_method": "word_combination"
-    }
+    return _patterns
 
-def generate_prefix_animal():
-    """Generate a team name using prefix + animal pattern"""
-    components = load_word_components()
-    
-    prefix = random.choice(components["prefixes"])
+def generate_team_name(existing_names=None):
+    """
+    Generate a team name using word combinations.
     
-    # Find compatible animals
-    compatible_animals = find_compatible_words("animals", prefix.get("compatibility"))
-    if not compatible_animals:
-        compatible_animals = components["animals"]
+    Args:
+        existing_names (list, optional): List of existing names to avoid duplicates
+        
+    Returns:
+        dict: A dictionary with name and description
+    """
+    existing_lower = {
+        (existing.get("name") if isinstance(existing, dict) else existing).lower()
+        for existing in existing_names or []
+        if (existing.get("name") if isinstance(existing, dict) else existing)
+    }
     
-    animal = random.choice(compatible_animals)
+    # Try up to 10 times to generate a unique name
+    for _ in range(10):
+        name_data = build_name_data(*generate_candidates(1)[0])
+        if name_data["name"].lower() not in existing_lower:
+            return name_data
     
-    # Get a random adjective for the description
-    adjective = random.choice(components["adjectives"])
+    # If we couldn't generate a unique name, add a random number to make it unique
+    name_data = build_name_data(*generate_candidates(1)[0])
+    name_data["name"] = f"{name_data['name']} {random.randint(1, 99)}"
+    return name_data
+
+def build_name_data(words, adjective=None):
+    """
+    Turn the words picked by a pattern into a name dictionary with a description.
     
-    name = f"{prefix['word']} {animal['word']}"
-    description = generate_description(prefix, animal, adjective)
+    Args:
+        words (tuple): The word components of the name, in order
+        adjective (dict, optional): Adjective to use in the description
+        
+    Returns:
+        dict: A dictionary with name and description
+    """
+    # Descriptions are written for two-part names; everything before the last
+    # word acts as the first part ("Swift Quantum" + "Falcons")
+    first = words[0]
+    if len(words) > 2:
+        first = dict(words[-2], word=" ".join(word["word"] for word in words[:-1]))
+    
+    # An adjective that is already part of the name would be repeated by
+    # "{adjective} {prefix}" templates ("The Swift Swift Falcons")
+    if adjective is not None and any(word is adjective for word in words[:-1]):
+        adjective = _other_adjective(words)
+    
+    for _ in range(MAX_DESCRIPTION_ATTEMPTS):
+        description = generate_description(first, words[-1], adjective)
+        if not _REPEATED_WORD.search(description):
+            break
+    else:
+        description = _REPEATED_WORD.sub(r"\1", description)
     
     return {
-        "name": name,
+        "name": " ".join(word["word"] for word in words),
         "description": description,
         "generation_method": "word_combination"
     }
 
+def _other_adjective(words):
+    """Pick an adjective for a description that isn't one of the name's words"""
+    used = {word["word"] for word in words}
+    adjectives = [word for word in load_word_components().get("adjectives", []) if word["word"] not in used]
+    return random.choice(adjectives) if adjectives else None
+
 def generate_description(word1, word2, adjective=None):
     """
     Generate a description using a template that matches the team name structure.
@@ -293,57 +534,275 @@ def generate_description(word1, word2, adjective=None):
     
     return description
 
-def generate_batch(count=20, existing_names=None):
+def _features(word):
+    """Precomputed (tags, category, initial, length, lowercase text) for a word"""
+    features = _word_features.get(id(word))
+    if features is None:
+        text = word.get("word", "")
+        features = (
+            frozenset(word.get("compatibility", [])),
+            word.get("category"),
+            text[:1].lower(),
+            len(text),
+            text.lower()
+        )
+        _word_features[id(word)] = features
+    return features
+
+def _multiword_phrases():
+    """Lexicon entries of more than one word, as token tuples keyed by their first token"""
+    global _lexicon_phrases
+    
+    if _lexicon_phrases is None:
+        components = load_word_components()
+        phrases = {
+            tuple(word["word"].lower().split())
+            for value in components.values() if isinstance(value, list)
+            for word in value if isinstance(word, dict) and "word" in word
+        }
+        by_first = {}
+        for phrase in sorted((phrase for phrase in phrases if len(phrase) > 1), key=len, reverse=True):
+            by_first.setdefault(phrase[0], []).append(phrase)
+        _lexicon_phrases = by_first
+    return _lexicon_phrases
+
+def word_usage_counts(names):
+    """
+    Count how often each word appears in a list of names.
+    
+    Args:
+        names (list): Name strings or name dictionaries
+        
+    Returns:
+        Counter: Lowercase lexicon word (or phrase, e.g. "hot dog") -> number
+            of names using it
+    """
+    phrases = _multiword_phrases()
+    counts = Counter()
+    for name in names:
+        text = name.get("name", "") if isinstance(name, dict) else name
+        tokens = text.lower().split()
+        i = 0
+        while i < len(tokens):
+            # Count multi-word lexicon entries ("Hot Dog") as one word, longest first
+            for phrase in phrases.get(tokens[i], ()):
+                if tuple(tokens[i:i + len(phrase)]) == phrase:
+                    counts[" ".join(phrase)] += 1
+                    i += len(phrase)
+                    break
+            else:
+                counts[tokens[i]] += 1
+                i += 1
+    return counts
+
+def candidate_name(candidate):
+    """The team name a (words, adjective) candidate would produce"""
+    return " ".join(word["word"] for word in candidate[0])
+
+def score_candidate(candidate, usage_counts=None):
+    """
+    Score a candidate name; higher is better.
+    
+    Features: compatibility tag overlap (Jaccard) between neighbouring words,
+    whether a word's category is one of its neighbour's compatibility tags,
+    alliteration, closeness to the ideal name length and novelty against
+    previously used words.
+    
+    Args:
+        candidate (tuple): (words, adjective) as returned by a pattern plan
+        usage_counts (Counter, optional): Word usage from word_usage_counts()
+        
+    Returns:
+        float: Weighted score between 0 and 1
+    """
+    features = [_features(word) for word in candidate[0]]
+    pairs = list(zip(features, features[1:]))
+    
+    tag_overlap = category_fit = alliteration = 0.0
+    for (tags1, category1, initial1, _, _), (tags2, category2, initial2, _, _) in pairs:
+        all_tags = tags1 | tags2
+        if all_tags:
+            tag_overlap += len(tags1 & tags2) / len(all_tags)
+        if category2 in tags1 or category1 in tags2:
+            category_fit += 1.0
+        if initial1 and initial1 == initial2:
+            alliteration += 1.0
+    
+    name_length = sum(feature[3] for feature in features) + len(features) - 1
+    length = max(0.0, 1.0 - abs(name_length - IDEAL_NAME_LENGTH) / IDEAL_NAME_LENGTH)
+    
+    novelty = 1.0
+    if usage_counts:
+        novelty = 1.0 / (1 + sum(usage_counts.get(feature[4], 0) for feature in features))
+    
+    return (SCORE_WEIGHTS["tag_overlap"] * tag_overlap / len(pairs) +
+            SCORE_WEIGHTS["category_fit"] * category_fit / len(pairs) +
+            SCORE_WEIGHTS["alliteration"] * alliteration / len(pairs) +
+            SCORE_WEIGHTS["length"] * length +
+            SCORE_WEIGHTS["novelty"] * novelty)
+
+def generate_candidates(n, patterns=None):
+    """
+    Pick n random candidate names.
+    
+    Patterns are chosen by their "weight" through an alias table, then each
+    compiled plan picks its words in constant time.
+    
+    Args:
+        n (int): Number of candidates
+        patterns (list, optional): Names of the patterns to use; defaults to all
+        
+    Returns:
+        list: (words, adjective) tuples
+        
+    Raises:
+        ValueError: If a pattern name is unknown
+    """
+    compiled = load_patterns()
+    if patterns:
+        unknown = [pattern for pattern in patterns if pattern not in compiled]
+        if unknown:
+            raise ValueError(f"Unknown name pattern(s): {', '.join(unknown)}")
+        plans = [compiled[pattern] for pattern in patterns]
+    else:
+        plans = list(compiled.values())
+    
+    table = AliasTable([plan.weight for plan in plans])
+    return [plans[table.sample()].sample() for _ in range(n)]
+
+def rank_candidates(candidates, k, usage_counts=None, accept=None):
+    """
+    Select the k best-scoring candidates.
+    
+    Candidates are scored once and heapified (O(n)); the best are then popped
+    one at a time (O(log n) each) until k have passed the accept check, so the
+    more expensive duplicate checks only run on the front-runners.
+    
+    Args:
+        candidates (list): (words, adjective) tuples
+        k (int): Number of candidates to return
+        usage_counts (Counter, optional): Word usage for the novelty score
+        accept (callable, optional): Returns False for candidates to skip
+        
+    Returns:
+        list: Up to k candidates, best first
+    """
+    heap = [(-score_candidate(candidate, usage_counts), i, candidate)
+            for i, candidate in enumerate(candidates)]
+    heapq.heapify(heap)
+    
+    ranked = []
+    while heap and len(ranked) < k:
+        _, _, candidate = heapq.heappop(heap)
+        if accept is None or accept(candidate):
+            ranked.append(candidate)
+    return ranked
+
+def generate_batch(count=20, existing_names=None, is_similar=None, patterns=None, is_allowed=None):
     """
     Generate a batch of team names.
     
+    Generates count * RANK_OVERSAMPLE candidates, ranks them with
+    score_candidate() and keeps the best distinct ones. Descriptions are only
+    built for the names that make the cut.
+    
     Args:
         count (int): Number of names to generate
         existing_names (list, optional): List of existing names to avoid duplicates
+        is_similar (callable, optional): Returns True for names that are
+            near-duplicates of stored names (e.g. NameStore.is_similar)
+        patterns (list, optional): Names of the patterns to use; defaults to all
+        is_allowed (callable, optional): Returns False for names that fail
+            input checks (e.g. name_filter.is_allowed)
         
     Returns:
-        list: List of generated name dictionaries
+        list: List of generated name dictionaries; shorter than count only if
+            no acceptable numbered name turns up either
     """
     existing_names = existing_names or []
-    batch = []
+    existing_lower = {n.lower() for n in existing_names}
+    usage_counts = word_usage_counts(existing_names)
+    
+    # Near-duplicates within the batch itself are filtered too. Generated names
+    # only differ by whole lexicon words, so compact keys ("Robo Falcon" ==
+    # "RoboFalcons") catch them without a fuzzy search.
+    batch_keys = set()
+    
+    def accept(candidate):
+        name = candidate_name(candidate)
+        key = compact_key(name)
+        if name.lower() in existing_lower or key in batch_keys:
+            return False
+        if is_similar is not None and is_similar(name):
+            return False
+        if is_allowed is not None and not is_allowed(name):
+            return False
+        batch_keys.add(key)
+        return True
     
     # Generate unique batch ID
     timestamp = datetime.now().strftime("%Y%m%d-%H%M%S")
     random_suffix = ''.join(random.choices('0123456789abcdef', k=8))
     batch_id = f"{timestamp}-{random_suffix}"
     
-    # Generate names
-    for _ in range(count):
-        # Get a name that doesn't exist in existing_names or already generated batch
-        name_data = None
-        for attempt in range(5):  # Try up to 5 times
-            temp_data = generate_team_name()
-            
-            # Check if this name is already in existing names or batch
-            if temp_data["name"].lower() not in [n.lower() for n in existing_names] and \
-               temp_data["name"].lower() not in [n["name"].lower() for n in batch]:
-                name_data = temp_data
-                break
-        
-        # If we couldn't find a unique name, add a random suffix
-        if name_data is None:
-            name_data = generate_team_name()
-            name_data["name"] = f"{name_data['name']} {random.randint(1, 99)}"
-        
-        # Add metadata
+    candidates = generate_candidates(count * RANK_OVERSAMPLE, patterns)
+    batch = [build_name_data(*candidate) for candidate in rank_candidates(candidates, count, usage_counts, accept)]
+    
+    # If the candidate pool ran dry, top up with numbered names. The number can
+    # push a long name past the length limit, so these are checked as well.
+    for _ in range(count * MAX_NUMBERED_ATTEMPTS):
+        if len(batch) >= count:
+            break
+        name_data = build_name_data(*generate_candidates(1, patterns)[0])
+        name_data["name"] = f"{name_data['name']} {random.randint(1, 99)}"
+        key = compact_key(name_data["name"])
+        if name_data["name"].lower() in existing_lower or key in batch_keys:
+            continue
+        if is_allowed is not None and not is_allowed(name_data["name"]):
+            continue
+        batch_keys.add(key)
+        batch.append(name_data)
+    
+    # Add metadata
+    for name_data in batch:
         name_data["id"] = generate_unique_id()
         name_data["batch_id"] = batch_id
         name_data["timestamp"] = datetime.now().timestamp()
         name_data["selected"] = False
         name_data["votes"] = 0
-        
-        batch.append(name_data)
+    
+    # Steer the next batches away from the words used in this one
+    record_usage(batch)
     
     return batch
 
+def benchmark_batch(count=50, repeats=20, existing_names=None):
+    """
+    Time generate_batch() and report the cost per requested name.
+    
+    Args:
+        count (int): Names per batch
+        repeats (int): Number of batches to time
+        existing_names (list, optional): Names to rank and deduplicate against
+        
+    Returns:
+        dict: Total seconds, names generated and microseconds per name
+    """
+    load_word_components()
+    start = time.perf_counter()
+    for _ in range(repeats):
+        generate_batch(count=count, existing_names=existing_names)
+    elapsed = time.perf_counter() - start
+    
+    names = count * repeats
+    return {
+        "seconds": elapsed,
+        "names": names,
+        "us_per_name": elapsed / names * 1_000_000
+    }
+
 def generate_unique_id():
     """Generate a unique ID for a team name"""
-    import uuid
     return str(uuid.uuid4())
 
 def get_random_team_name():
@@ -360,4 +819,11 @@ def get_random_team_name():
     name_data["timestamp"] = datetime.now().timestamp()
     name_data["votes"] = 0
     
+    record_usage([name_data])
+    
     return name_data
+
+if __name__ == '__main__':
+    result = benchmark_batch()
+    print(f"Generated {result['names']} names in {result['seconds']:.3f}s "
+          f"({result['us_per_name']:.1f} us per name, oversample x{RANK_OVERSAMPLE})")
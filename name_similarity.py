@@ -0,0 +1,300 @@
+"""FLL Team Name Generator - Name Similarity Module
+
+Finds near-duplicate team names so "Robo Falcons", "RoboFalcons" and
+"Robo Falcon" are recognised as the same idea. Each name is reduced to:
+
+- a compact key (lowercase letters and digits, simple plurals removed)
+- a phonetic key (Soundex code per word)
+
+Compact keys are looked up in a hash index and a BK-tree, so names within a
+small edit distance are found without comparing against every stored name.
+Names with the same phonetic key are only candidates: they match if their
+compact keys are within one extra edit, and the real edit distance is
+reported. The index is updated incrementally as names are added, renamed or
+removed.
+"""
+
+import re
+import unicodedata
+
+# Constants
+PHONETIC_EXTRA_DISTANCE = 1  # Extra edits tolerated between names that also sound alike
+_NON_ALNUM = re.compile(r'[^a-z0-9]+')
+_SOUNDEX_CODES = {
+    **dict.fromkeys('bfpv', '1'),
+    **dict.fromkeys('cgjkqsxz', '2'),
+    **dict.fromkeys('dt', '3'),
+    'l': '4',
+    **dict.fromkeys('mn', '5'),
+    'r': '6'
+}
+
+
+def _tokens(name):
+    """Split a name into lowercase ASCII words with simple plurals removed"""
+    text = unicodedata.normalize('NFKD', name or '')
+    text = text.encode('ascii', 'ignore').decode('ascii').lower()
+    tokens = []
+    for token in _NON_ALNUM.split(text):
+        if not token:
+            continue
+        if len(token) > 3 and token.endswith('s') and not token.endswith('ss'):
+            token = token[:-1]
+        tokens.append(token)
+    return tokens
+
+
+def compact_key(name):
+    """
+    Reduce a name to a spacing-, case- and plural-insensitive key.
+
+    "Robo Falcons", "RoboFalcons" and "robo-falcon" all become "robofalcon".
+    """
+    return ''.join(_tokens(name))
+
+
+def _soundex(word):
+    if not word[0].isalpha():
+        return word
+    code = word[0]
+    last = _SOUNDEX_CODES.get(word[0], '')
+    for char in word[1:]:
+        digit = _SOUNDEX_CODES.get(char, '')
+        if digit and digit != last:
+            code += digit
+        if char not in 'hw':
+            last = digit
+    return (code + '000')[:4]
+
+
+def phonetic_key(name):
+    """Reduce a name to one Soundex code per word, e.g. "Nite Nights" -> "n300 n230" """
+    return ' '.join(_soundex(token) for token in _tokens(name))
+
+
+def edit_distance(a, b, max_distance=None):
+    """
+    Levenshtein distance between two strings.
+
+    Uses the bit-parallel algorithm of Myers/Hyyro: one pass over b with a
+    handful of integer operations per character instead of a full DP table.
+
+    Args:
+        a (str): First string
+        b (str): Second string
+        max_distance (int, optional): Report any distance above this as max_distance + 1
+
+    Returns:
+        int: The edit distance, capped at max_distance + 1 if given
+    """
+    if a == b:
+        return 0
+    if max_distance is not None and abs(len(a) - len(b)) > max_distance:
+        return max_distance + 1
+    if not a or not b:
+        distance = len(a) or len(b)
+        return distance if max_distance is None else min(distance, max_distance + 1)
+
+    # Bit masks of where each character occurs in a
+    positions = {}
+    for i, char in enumerate(a):
+        positions[char] = positions.get(char, 0) | (1 << i)
+
+    mask = (1 << len(a)) - 1
+    last_bit = 1 << (len(a) - 1)
+    plus_vertical = mask
+    minus_vertical = 0
+    distance = len(a)
+
+    for char in b:
+        eq = positions.get(char, 0)
+        x_vertical = eq | minus_vertical
+        x_horizontal = (((eq & plus_vertical) + plus_vertical) ^ plus_vertical) | eq
+        plus_horizontal = minus_vertical | (~(x_horizontal | plus_vertical) & mask)
+        minus_horizontal = plus_vertical & x_horizontal
+
+        if plus_horizontal & last_bit:
+            distance += 1
+        elif minus_horizontal & last_bit:
+            distance -= 1
+
+        plus_horizontal = ((plus_horizontal << 1) | 1) & mask
+        minus_horizontal = (minus_horizontal << 1) & mask
+        plus_vertical = minus_horizontal | (~(x_vertical | plus_horizontal) & mask)
+        minus_vertical = plus_horizontal & x_vertical
+
+    if max_distance is not None and distance > max_distance:
+        return max_distance + 1
+    return distance
+
+
+def default_max_distance(key):
+    """How many typos to tolerate for a compact key of this length"""
+    if len(key) < 6:
+        return 0
+    if len(key) < 12:
+        return 1
+    return 2
+
+
+class BKTree:
+    """Burkhard-Keller tree of strings for edit-distance range queries."""
+
+    def __init__(self):
+        self._root = None
+        self._size = 0
+
+    def __len__(self):
+        return self._size
+
+    def add(self, key):
+        """Add a key; adding an existing key does nothing"""
+        if self._root is None:
+            self._root = (key, {})
+            self._size = 1
+            return
+
+        node_key, children = self._root
+        while True:
+            distance = edit_distance(key, node_key)
+            if distance == 0:
+                return
+            child = children.get(distance)
+            if child is None:
+                children[distance] = (key, {})
+                self._size += 1
+                return
+            node_key, children = child
+
+    def search(self, key, max_distance):
+        """
+        Find stored keys within max_distance edits of key.
+
+        Returns:
+            list: (distance, key) tuples
+        """
+        if self._root is None:
+            return []
+
+        results = []
+        pending = [self._root]
+        while pending:
+            node_key, children = pending.pop()
+            distance = edit_distance(key, node_key)
+            if distance <= max_distance:
+                results.append((distance, node_key))
+            # Triangle inequality: only children in this band can match
+            for child_distance in range(distance - max_distance, distance + max_distance + 1):
+                child = children.get(child_distance)
+                if child is not None:
+                    pending.append(child)
+        return results
+
+
+class NameIndex:
+    """Incrementally maintained near-duplicate index over stored names."""
+
+    def __init__(self, names=None):
+        self._names = {}  # id -> name
+        self._by_key = {}  # compact key -> set of ids
+        self._by_phonetic = {}  # phonetic key -> set of ids
+        self._tree = BKTree()
+        if names:
+            self.sync(names)
+
+    def __len__(self):
+        return len(self._names)
+
+    def add(self, name_id, name):
+        """Add or rename a single name"""
+        if self._names.get(name_id) == name:
+            return
+        self.remove(name_id)
+
+        key = compact_key(name)
+        if not key:
+            return
+        self._names[name_id] = name
+        self._by_key.setdefault(key, set()).add(name_id)
+        self._by_phonetic.setdefault(phonetic_key(name), set()).add(name_id)
+        # BK-trees don't support deletion; keys left without IDs are skipped at query time
+        self._tree.add(key)
+
+    def remove(self, name_id):
+        """Remove a name by ID if it is indexed"""
+        name = self._names.pop(name_id, None)
+        if name is None:
+            return
+        self._discard(self._by_key, compact_key(name), name_id)
+        self._discard(self._by_phonetic, phonetic_key(name), name_id)
+
+    @staticmethod
+    def _discard(index, key, name_id):
+        ids = index.get(key)
+        if ids is not None:
+            ids.discard(name_id)
+            if not ids:
+                del index[key]
+
+    def sync(self, names):
+        """
+        Bring the index in line with a full list of stored names.
+
+        Only names that were added, renamed or removed are touched.
+
+        Args:
+            names (list): Name dictionaries with "id" and "name" fields
+        """
+        current = {name.get('id'): name.get('name', '') for name in names if name.get('id')}
+        for name_id in [name_id for name_id in self._names if name_id not in current]:
+            self.remove(name_id)
+        for name_id, name in current.items():
+            self.add(name_id, name)
+
+    def find_similar(self, name, max_distance=None, limit=5, exclude_id=None):
+        """
+        Find stored names that look or sound like the given name.
+
+        Args:
+            name (str): The name to check
+            max_distance (int, optional): Edit distance to allow between compact keys;
+                defaults to a length-based tolerance
+            limit (int): Maximum number of matches to return
+            exclude_id (str, optional): ID to leave out, e.g. the name being edited
+
+        Returns:
+            list: Matches as {"id", "name", "distance"} dicts, closest first
+        """
+        key = compact_key(name)
+        if not key:
+            return []
+        if max_distance is None:
+            max_distance = default_max_distance(key)
+
+        matches = {}
+        for distance, match_key in self._tree.search(key, max_distance):
+            for name_id in self._by_key.get(match_key, ()):
+                matches[name_id] = min(distance, matches.get(name_id, distance))
+        # Sounding alike only earns a name one extra edit, never a free pass:
+        # many unrelated words share Soundex codes (Core/Crew/Curious)
+        phonetic_max_distance = max_distance + PHONETIC_EXTRA_DISTANCE
+        for name_id in self._by_phonetic.get(phonetic_key(name), ()):
+            if name_id in matches:
+                continue
+            distance = edit_distance(key, compact_key(self._names[name_id]), phonetic_max_distance)
+            if distance <= phonetic_max_distance:
+                matches[name_id] = distance
+
+        matches.pop(exclude_id, None)
+        ranked = sorted(matches.items(), key=lambda item: (item[1], self._names[item[0]]))
+        return [
+            {"id": name_id, "name": self._names[name_id], "distance": distance}
+            for name_id, distance in ranked[:limit]
+        ]
+
+    def is_similar(self, name):
+        """Check whether any stored name is a near-duplicate of name"""
+        # Exact key hits are the common case and skip the tree walk
+        if compact_key(name) in self._by_key:
+            return True
+        return bool(self.find_similar(name, limit=1))
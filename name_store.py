@@ -0,0 +1,390 @@
+"""FLL Team Name Generator - Name Store Module
+
+Workspace-sharded storage for saved team names. Every workspace (an event or a
+single team) owns its own JSON shard on disk with its own lock, so one busy
+team never blocks writes for another. Shards are loaded lazily on first access
+and their cached names are dropped from memory again once they sit idle.
+
+Several worker processes can serve the same shards. Each process checks the
+file's size, mtime and inode before using its cached copy and reloads it if
+another process saved meanwhile, and load-modify-save cycles hold an exclusive
+lock on a "<names file>.lock" file as well as the in-process lock.
+
+The "default" workspace maps onto the original data/names.json file so existing
+deployments keep working unchanged.
+"""
+
+import json
+import os
+import re
+import shutil
+import threading
+import time
+from datetime import datetime
+
+from name_similarity import NameIndex
+
+try:
+    import fcntl
+except ImportError:  # Windows: locking only covers threads of one process
+    fcntl = None
+
+# Constants
+DATA_DIR = os.path.join(os.path.dirname(__file__), 'data')
+WORKSPACES_DIR = os.path.join(DATA_DIR, 'workspaces')
+DEFAULT_WORKSPACE = 'default'
+SHARD_IDLE_SECONDS = 15 * 60  # Drop cached names after 15 idle minutes
+EVICTION_INTERVAL_SECONDS = 60  # How often to sweep for idle shards
+WORKSPACE_ID_PATTERN = re.compile(r'^[A-Za-z0-9][A-Za-z0-9_-]{0,63}$')
+
+
+class ShardLock:
+    """Re-entrant lock held across threads (RLock) and processes (flock on a file)."""
+
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.RLock()
+        self._depth = 0
+        self._file = None
+
+    def acquire(self, blocking=True):
+        """
+        Take the lock; only the outermost acquire in a thread locks the file.
+
+        Returns:
+            bool: False if blocking is off and another thread or process holds it
+        """
+        if not self._lock.acquire(blocking):
+            return False
+        if self._depth == 0 and fcntl is not None:
+            lock_file = None
+            try:
+                os.makedirs(os.path.dirname(self.path), exist_ok=True)
+                lock_file = open(self.path, 'a')
+                fcntl.flock(lock_file, fcntl.LOCK_EX | (0 if blocking else fcntl.LOCK_NB))
+            except BaseException as e:
+                if lock_file is not None:
+                    lock_file.close()
+                self._lock.release()
+                if isinstance(e, BlockingIOError) and not blocking:
+                    return False
+                raise
+            self._file = lock_file
+        self._depth += 1
+        return True
+
+    def release(self):
+        self._depth -= 1
+        if self._depth == 0 and self._file is not None:
+            fcntl.flock(self._file, fcntl.LOCK_UN)
+            self._file.close()
+            self._file = None
+        self._lock.release()
+
+    def __enter__(self):
+        self.acquire()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.release()
+
+
+class NameStore:
+    """A single workspace shard: one names file, one backup dir, one lock."""
+
+    def __init__(self, workspace_id, names_file, backup_dir):
+        self.workspace_id = workspace_id
+        self.names_file = names_file
+        self.backup_dir = backup_dir
+        self.lock = ShardLock(f"{names_file}.lock")
+        self.last_access = time.monotonic()
+        self._names = None
+        self._index = None
+        self._signature = None  # (mtime_ns, size, inode) of the file _names came from
+
+    @property
+    def is_loaded(self):
+        return self._names is not None
+
+    def _file_signature(self):
+        try:
+            stat = os.stat(self.names_file)
+        except FileNotFoundError:
+            return None
+        return stat.st_mtime_ns, stat.st_size, stat.st_ino
+
+    def _ensure_loaded(self):
+        """Load the names, or reload them if another process changed the file"""
+        self.last_access = time.monotonic()
+        signature = self._file_signature()
+        if self._names is not None and signature == self._signature:
+            return
+        try:
+            with open(self.names_file, 'r') as f:
+                self._names = json.load(f)
+        except (json.JSONDecodeError, FileNotFoundError):
+            self._names = []
+        self._signature = signature
+        if self._index is not None:
+            self._index.sync(self._names)
+
+    def _similarity_index(self):
+        self._ensure_loaded()
+        if self._index is None:
+            self._index = NameIndex(self._names)
+        return self._index
+
+    def find_similar(self, name, limit=5, exclude_id=None):
+        """
+        Find stored names that are near-duplicates of the given name.
+
+        Args:
+            name (str): The name to check
+            limit (int): Maximum number of matches to return
+            exclude_id (str, optional): ID of a stored name to ignore
+
+        Returns:
+            list: Matches as {"id", "name", "distance"} dicts, closest first
+        """
+        with self.lock:
+            return self._similarity_index().find_similar(name, limit=limit, exclude_id=exclude_id)
+
+    def is_similar(self, name):
+        """Check whether a near-duplicate of name is already stored"""
+        return bool(self.find_similar(name, limit=1))
+
+    def initialize(self):
+        """Create the shard's directories and an empty names file if missing"""
+        with self.lock:
+            os.makedirs(os.path.dirname(self.names_file), exist_ok=True)
+            os.makedirs(self.backup_dir, exist_ok=True)
+            if not os.path.exists(self.names_file):
+                with open(self.names_file, 'w') as f:
+                    json.dump([], f)
+
+    def load(self):
+        """
+        Load the names stored in this workspace.
+
+        Returns:
+            list: A copy of the stored name dictionaries, safe to modify
+        """
+        with self.lock:
+            self._ensure_loaded()
+            return [dict(name) for name in self._names]
+
+    def iter_names(self):
+        """
+        Iterate over the stored names without copying the whole list.
+
+        Saves swap in a new list rather than mutating the old one, so iteration
+        keeps a consistent snapshot even if another request saves meanwhile.
+
+        Yields:
+            dict: A copy of each stored name dictionary
+        """
+        with self.lock:
+            self._ensure_loaded()
+            names = self._names
+        for name in names:
+            yield dict(name)
+
+    def upsert(self, records, defaults=None):
+        """
+        Insert or update names by ID and persist them with a single save.
+
+        Updates are merged into the stored record, so fields the incoming
+        record leaves out (votes, created_at, ...) keep their stored values.
+
+        Args:
+            records (iterable): Name dictionaries; those without an "id" are skipped
+            defaults (callable, optional): Returns the fields to fill in on
+                records that are inserted rather than updated
+
+        Returns:
+            dict: Counts of added, updated and skipped records plus the saved
+                names and the ones among them that were added
+        """
+        with self.lock:
+            self._ensure_loaded()
+            names = list(self._names)
+            index = {name.get('id'): position for position, name in enumerate(names)}
+
+            added_count = 0
+            updated_count = 0
+            skipped_count = 0
+            saved_names = []
+            added_names = []
+
+            for record in records:
+                name_id = record.get('id')
+                if not name_id:
+                    skipped_count += 1
+                    continue
+
+                position = index.get(name_id)
+                if position is None:
+                    if defaults is not None:
+                        record = {**record, **{key: value for key, value in defaults().items()
+                                               if key not in record}}
+                    index[name_id] = len(names)
+                    names.append(record)
+                    added_names.append(record)
+                    added_count += 1
+                else:
+                    record = {**names[position], **record}
+                    names[position] = record
+                    updated_count += 1
+                saved_names.append(record)
+
+            if added_count or updated_count:
+                self.save(names)
+
+            return {
+                'added': added_count,
+                'updated': updated_count,
+                'skipped': skipped_count,
+                'saved_names': saved_names,
+                'added_names': added_names
+            }
+
+    def save(self, names):
+        """
+        Persist the full list of names for this workspace.
+
+        The file is written to a temporary path and swapped in atomically so a
+        crash mid-write never leaves a truncated shard behind.
+
+        Args:
+            names (list): The complete list of name dictionaries
+        """
+        with self.lock:
+            os.makedirs(os.path.dirname(self.names_file), exist_ok=True)
+            temp_file = f"{self.names_file}.tmp"
+            with open(temp_file, 'w') as f:
+                json.dump(names, f, indent=2)
+            os.replace(temp_file, self.names_file)
+            self._names = [dict(name) for name in names]
+            self._signature = self._file_signature()
+            self.last_access = time.monotonic()
+            if self._index is not None:
+                self._index.sync(self._names)
+
+    def create_backup(self):
+        """Create a timestamped backup of this workspace's names file"""
+        with self.lock:
+            try:
+                if not os.path.exists(self.names_file):
+                    return None
+
+                timestamp = datetime.now().strftime("%Y%m%d-%H%M%S")
+                backup_filename = f"names-{timestamp}.json.bak"
+                backup_path = os.path.join(self.backup_dir, backup_filename)
+
+                os.makedirs(self.backup_dir, exist_ok=True)
+                shutil.copy2(self.names_file, backup_path)
+
+                print(f"Created backup: {backup_path}")
+                return backup_filename
+            except Exception as e:
+                print(f"Error creating backup: {str(e)}")
+                return None
+
+    def evict_if_idle(self, now, max_idle_seconds):
+        """
+        Drop the cached names if this shard has been idle long enough.
+
+        Returns:
+            bool: True if the shard was evicted
+        """
+        if self._names is None or now - self.last_access < max_idle_seconds:
+            return False
+        # Never wait on a busy shard - if it's locked it isn't idle
+        if not self.lock.acquire(blocking=False):
+            return False
+        try:
+            self._names = None
+            self._index = None
+            self._signature = None
+            return True
+        finally:
+            self.lock.release()
+
+
+# Registry of workspace shards. NameStore objects are tiny and are kept for the
+# life of the process so every caller shares the same lock; only their cached
+# names are evicted.
+_stores = {}
+_stores_lock = threading.Lock()
+_last_eviction = time.monotonic()
+
+
+def is_valid_workspace_id(workspace_id):
+    """Check that a workspace ID is safe to use as a directory name"""
+    return bool(workspace_id) and WORKSPACE_ID_PATTERN.match(workspace_id) is not None
+
+
+def _store_paths(workspace_id):
+    if workspace_id == DEFAULT_WORKSPACE:
+        return os.path.join(DATA_DIR, 'names.json'), os.path.join(DATA_DIR, 'backups')
+    workspace_dir = os.path.join(WORKSPACES_DIR, workspace_id)
+    return os.path.join(workspace_dir, 'names.json'), os.path.join(workspace_dir, 'backups')
+
+
+def get_store(workspace_id=None):
+    """
+    Get the store for a workspace, creating its shard entry on first access.
+
+    Args:
+        workspace_id (str, optional): Event or team ID; defaults to the shared workspace
+
+    Returns:
+        NameStore: The workspace's store
+
+    Raises:
+        ValueError: If the workspace ID contains unsafe characters
+    """
+    workspace_id = workspace_id or DEFAULT_WORKSPACE
+    if not is_valid_workspace_id(workspace_id):
+        raise ValueError(f"Invalid workspace ID: {workspace_id!r}")
+
+    with _stores_lock:
+        store = _stores.get(workspace_id)
+        if store is None:
+            names_file, backup_dir = _store_paths(workspace_id)
+            store = NameStore(workspace_id, names_file, backup_dir)
+            _stores[workspace_id] = store
+
+    _maybe_evict_idle()
+    return store
+
+
+def evict_idle_stores(max_idle_seconds=SHARD_IDLE_SECONDS):
+    """
+    Drop cached names for every shard that has been idle too long.
+
+    Returns:
+        int: Number of shards evicted
+    """
+    now = time.monotonic()
+    with _stores_lock:
+        stores = list(_stores.values())
+    return sum(1 for store in stores if store.evict_if_idle(now, max_idle_seconds))
+
+
+def _maybe_evict_idle():
+    global _last_eviction
+
+    now = time.monotonic()
+    if now - _last_eviction < EVICTION_INTERVAL_SECONDS:
+        return
+    _last_eviction = now
+    evicted = evict_idle_stores()
+    if evicted:
+        print(f"Evicted {evicted} idle workspace shard(s) from memory")
+
+
+def loaded_workspaces():
+    """Return the IDs of workspaces whose names are currently held in memory"""
+    with _stores_lock:
+        return [workspace_id for workspace_id, store in _stores.items() if store.is_loaded]
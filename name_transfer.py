@@ -0,0 +1,261 @@
+"""FLL Team Name Generator - Bulk Import/Export Module
+
+Streams saved team names in and out of a workspace as JSONL or CSV. Exports are
+produced one line at a time straight from the store; imports are parsed one
+line at a time and upserted by ID in a single save; records without an ID are
+matched to stored names by name.
+
+Can also be run from the command line:
+
+    python name_transfer.py export --workspace team-42 --format csv -o names.csv
+    python name_transfer.py import names.jsonl --workspace team-42
+
+Importing while the web app is running is safe: the import takes the shard's
+file lock, and the app reloads the shard once it sees the file has changed.
+"""
+
+import argparse
+import csv
+import io
+import json
+import sys
+import uuid
+from datetime import datetime
+
+import name_filter
+import name_store
+from name_similarity import compact_key
+
+# Constants
+FORMATS = ('jsonl', 'csv')
+CSV_FIELDS = ['id', 'name', 'description', 'votes', 'source', 'created_at', 'batch_id', 'generation_method']
+IMPORT_ID_NAMESPACE = uuid.UUID('5b0e6f3a-2c1d-4e8b-9a7f-3d6c1e2b4a90')  # For IDs derived from names
+MIME_TYPES = {
+    'jsonl': 'application/x-ndjson',
+    'csv': 'text/csv'
+}
+
+
+def iter_export(names, fmt='jsonl'):
+    """
+    Serialize names one line at a time.
+
+    Args:
+        names (iterable): Name dictionaries, e.g. NameStore.iter_names()
+        fmt (str): "jsonl" or "csv"
+
+    Yields:
+        str: One line of output, including its trailing newline
+    """
+    if fmt not in FORMATS:
+        raise ValueError(f"Unsupported format: {fmt}")
+
+    if fmt == 'jsonl':
+        for name in names:
+            yield json.dumps(name) + "\n"
+        return
+
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=CSV_FIELDS, extrasaction='ignore', lineterminator="\n")
+    writer.writeheader()
+    for name in names:
+        writer.writerow(name)
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate(0)
+    # Header only if there were no names
+    if buffer.getvalue():
+        yield buffer.getvalue()
+
+
+def _normalize_record(record):
+    """
+    Tidy an imported record: a valid name and integer votes if given.
+
+    Defaults for the other fields are only filled in when the record turns
+    out to be new (see _new_record_defaults), so re-importing a partial
+    record never resets what is already stored.
+
+    Returns:
+        tuple: (normalized record or None, error message or None)
+    """
+    if not (record.get('name') or '').strip():
+        return None, "missing team name"
+    name, error = name_filter.check_name(record['name'])
+    if error:
+        return None, f"{name}: {error}"
+
+    # CSV gives us empty strings for missing columns
+    normalized = {
+        key: value for key, value in record.items()
+        if key is not None and value not in (None, '')
+    }
+    normalized['name'] = name
+    if 'votes' in normalized:
+        try:
+            normalized['votes'] = max(0, int(normalized['votes']))
+        except (TypeError, ValueError):
+            del normalized['votes']
+    return normalized, None
+
+
+def _new_record_defaults():
+    """Fields filled in on imported names that weren't stored before"""
+    return {
+        'votes': 0,
+        'source': 'import',
+        'created_at': datetime.now().isoformat()
+    }
+
+
+def iter_import(lines, fmt='jsonl', errors=None):
+    """
+    Parse imported lines into name records without reading everything first.
+
+    Args:
+        lines (iterable): Text lines, e.g. an open file
+        fmt (str): "jsonl" or "csv"
+        errors (list, optional): Collects a message for every line that was skipped
+
+    Yields:
+        dict: A normalized name record
+    """
+    if fmt not in FORMATS:
+        raise ValueError(f"Unsupported format: {fmt}")
+
+    errors = errors if errors is not None else []
+
+    if fmt == 'csv':
+        records = _iter_csv(lines)
+    else:
+        records = _iter_jsonl(lines, errors)
+
+    for line_number, record in records:
+        if not isinstance(record, dict):
+            errors.append(f"Line {line_number}: expected an object")
+            continue
+        normalized, error = _normalize_record(record)
+        if error:
+            errors.append(f"Line {line_number}: {error}")
+            continue
+        yield normalized
+
+
+def _iter_csv(lines):
+    reader = csv.DictReader(lines)
+    for row in reader:
+        yield reader.line_num, row
+
+
+def _iter_jsonl(lines, errors):
+    for line_number, line in enumerate(lines, start=1):
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            yield line_number, json.loads(line)
+        except json.JSONDecodeError as e:
+            errors.append(f"Line {line_number}: {str(e)}")
+
+
+def _assign_ids(store, records):
+    """
+    Give records without an ID the ID of the stored name they match.
+
+    Names match on their compact key (case, spacing and plurals ignored). A
+    name that isn't stored yet gets an ID derived from its key, so importing
+    the same file twice updates the names instead of adding them again.
+    Runs lazily inside NameStore.upsert, so it sees the store under its lock.
+    """
+    ids_by_key = None
+    for record in records:
+        if not record.get('id'):
+            if ids_by_key is None:
+                ids_by_key = {compact_key(name.get('name', '')): name['id']
+                              for name in store.iter_names() if name.get('id')}
+            key = compact_key(record['name'])
+            record['id'] = ids_by_key.setdefault(key, str(uuid.uuid5(IMPORT_ID_NAMESPACE, key)))
+        yield record
+
+
+def import_names(store, lines, fmt='jsonl'):
+    """
+    Upsert imported names into a store with a single save.
+
+    Args:
+        store (NameStore): The workspace store to import into
+        lines (iterable): Text lines in the given format
+        fmt (str): "jsonl" or "csv"
+
+    Returns:
+        dict: Counts of added, updated and skipped records, the added names
+            and any line errors
+    """
+    errors = []
+    records = _assign_ids(store, iter_import(lines, fmt, errors))
+    result = store.upsert(records, defaults=_new_record_defaults)
+    return {
+        'added': result['added'],
+        'updated': result['updated'],
+        'skipped': result['skipped'] + len(errors),
+        'added_names': result['added_names'],
+        'errors': errors
+    }
+
+
+def guess_format(filename, default='jsonl'):
+    """Pick a format from a file extension"""
+    if filename and filename.lower().endswith('.csv'):
+        return 'csv'
+    return default
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Import or export saved FLL team names")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    export_parser = subparsers.add_parser('export', help="Write a workspace's names to a file or stdout")
+    export_parser.add_argument('-o', '--output', help="Output file (default: stdout)")
+
+    import_parser = subparsers.add_parser('import', help="Upsert names from a file or stdin into a workspace")
+    import_parser.add_argument('input', nargs='?', help="Input file (default: stdin)")
+
+    for sub in (export_parser, import_parser):
+        sub.add_argument('-w', '--workspace', default=name_store.DEFAULT_WORKSPACE, help="Workspace ID")
+        sub.add_argument('-f', '--format', choices=FORMATS, help="jsonl or csv (default: from file extension)")
+
+    args = parser.parse_args(argv)
+
+    try:
+        store = name_store.get_store(args.workspace)
+    except ValueError as e:
+        parser.error(str(e))
+
+    if args.command == 'export':
+        fmt = args.format or guess_format(args.output)
+        out = open(args.output, 'w', newline='') if args.output else sys.stdout
+        try:
+            for line in iter_export(store.iter_names(), fmt):
+                out.write(line)
+        finally:
+            if args.output:
+                out.close()
+        return 0
+
+    fmt = args.format or guess_format(args.input)
+    source = open(args.input, 'r', newline='', encoding='utf-8') if args.input else sys.stdin
+    try:
+        result = import_names(store, source, fmt)
+    finally:
+        if args.input:
+            source.close()
+
+    for error in result['errors']:
+        print(error, file=sys.stderr)
+    print(f"Imported into '{store.workspace_id}': {result['added']} added, "
+          f"{result['updated']} updated, {result['skipped']} skipped", file=sys.stderr)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,195 @@
+"""FLL Team Name Generator - Session Store Module
+
+Server-side storage for each visitor's votes. The browser cookie only carries a
+random session ID; the set of names a session has voted for lives here, so vote
+checks are O(1) set lookups and the cookie never grows.
+
+Two backends are available:
+
+- "memory": a dict of sets with an idle timeout; fastest, lost on restart
+- "sqlite": a small SQLite database, so votes survive restarts and are shared
+  by every worker process on the host
+"""
+
+import os
+import sqlite3
+import threading
+import time
+
+# Constants
+DATA_DIR = os.path.join(os.path.dirname(__file__), 'data')
+DEFAULT_SQLITE_PATH = os.path.join(DATA_DIR, 'sessions.sqlite3')
+DEFAULT_TTL_SECONDS = 30 * 24 * 60 * 60  # Forget sessions idle for 30 days
+PURGE_INTERVAL_SECONDS = 60 * 60  # How often to sweep expired sessions
+BACKENDS = ('memory', 'sqlite')
+
+
+class MemoryVoteStore:
+    """In-process vote store: session ID -> set of voted name IDs."""
+
+    def __init__(self, ttl_seconds=DEFAULT_TTL_SECONDS):
+        self.ttl_seconds = ttl_seconds
+        self._votes = {}  # session ID -> set of name IDs
+        self._expires = {}  # session ID -> expiry time
+        self._lock = threading.Lock()
+        self._last_purge = time.monotonic()
+
+    def _touch(self, session_id, now):
+        self._expires[session_id] = now + self.ttl_seconds
+        if now - self._last_purge >= PURGE_INTERVAL_SECONDS:
+            self._last_purge = now
+            for expired_id in [sid for sid, expires in self._expires.items() if expires <= now]:
+                self._expires.pop(expired_id, None)
+                self._votes.pop(expired_id, None)
+
+    def get_votes(self, session_id):
+        """
+        Get the names a session has voted for.
+
+        Args:
+            session_id (str): The visitor's session ID
+
+        Returns:
+            frozenset: IDs of the names the session voted for
+        """
+        now = time.monotonic()
+        with self._lock:
+            if self._expires.get(session_id, now) < now:
+                self._votes.pop(session_id, None)
+            self._touch(session_id, now)
+            return frozenset(self._votes.get(session_id, ()))
+
+    def add_votes(self, session_id, name_ids):
+        """Record votes for several names at once (used to migrate old cookies)"""
+        with self._lock:
+            self._touch(session_id, time.monotonic())
+            self._votes.setdefault(session_id, set()).update(name_ids)
+
+    def toggle_vote(self, session_id, name_id):
+        """
+        Add the session's vote for a name, or take it back if already cast.
+
+        Returns:
+            bool: True if the session now votes for the name
+        """
+        with self._lock:
+            self._touch(session_id, time.monotonic())
+            votes = self._votes.setdefault(session_id, set())
+            if name_id in votes:
+                votes.discard(name_id)
+                return False
+            votes.add(name_id)
+            return True
+
+
+class SqliteVoteStore:
+    """SQLite-backed vote store shared by all threads and processes on a host."""
+
+    def __init__(self, path=DEFAULT_SQLITE_PATH, ttl_seconds=DEFAULT_TTL_SECONDS):
+        self.path = path
+        self.ttl_seconds = ttl_seconds
+        self._local = threading.local()
+        self._last_purge = 0.0
+
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        with self._connection() as conn:
+            conn.executescript("""
+                CREATE TABLE IF NOT EXISTS sessions (
+                    session_id TEXT PRIMARY KEY,
+                    expires_at REAL NOT NULL
+                );
+                CREATE TABLE IF NOT EXISTS votes (
+                    session_id TEXT NOT NULL,
+                    name_id TEXT NOT NULL,
+                    PRIMARY KEY (session_id, name_id)
+                ) WITHOUT ROWID;
+                CREATE INDEX IF NOT EXISTS sessions_expires_at ON sessions (expires_at);
+            """)
+
+    def _connection(self):
+        # sqlite3 connections can't be shared across threads; keep one per thread
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=10)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def _touch(self, conn, session_id):
+        now = time.time()
+        conn.execute(
+            "INSERT INTO sessions (session_id, expires_at) VALUES (?, ?) "
+            "ON CONFLICT (session_id) DO UPDATE SET expires_at = excluded.expires_at",
+            (session_id, now + self.ttl_seconds)
+        )
+        if now - self._last_purge >= PURGE_INTERVAL_SECONDS:
+            self._last_purge = now
+            conn.execute(
+                "DELETE FROM votes WHERE session_id IN (SELECT session_id FROM sessions WHERE expires_at <= ?)",
+                (now,)
+            )
+            conn.execute("DELETE FROM sessions WHERE expires_at <= ?", (now,))
+
+    def get_votes(self, session_id):
+        """
+        Get the names a session has voted for.
+
+        Args:
+            session_id (str): The visitor's session ID
+
+        Returns:
+            frozenset: IDs of the names the session voted for
+        """
+        with self._connection() as conn:
+            self._touch(conn, session_id)
+            rows = conn.execute("SELECT name_id FROM votes WHERE session_id = ?", (session_id,))
+            return frozenset(row[0] for row in rows)
+
+    def add_votes(self, session_id, name_ids):
+        """Record votes for several names at once (used to migrate old cookies)"""
+        with self._connection() as conn:
+            self._touch(conn, session_id)
+            conn.executemany(
+                "INSERT OR IGNORE INTO votes (session_id, name_id) VALUES (?, ?)",
+                [(session_id, name_id) for name_id in name_ids]
+            )
+
+    def toggle_vote(self, session_id, name_id):
+        """
+        Add the session's vote for a name, or take it back if already cast.
+
+        Returns:
+            bool: True if the session now votes for the name
+        """
+        with self._connection() as conn:
+            self._touch(conn, session_id)
+            removed = conn.execute(
+                "DELETE FROM votes WHERE session_id = ? AND name_id = ?", (session_id, name_id)
+            ).rowcount
+            if removed:
+                return False
+            conn.execute("INSERT INTO votes (session_id, name_id) VALUES (?, ?)", (session_id, name_id))
+            return True
+
+
+def create_vote_store(backend='sqlite', ttl_seconds=DEFAULT_TTL_SECONDS, sqlite_path=DEFAULT_SQLITE_PATH):
+    """
+    Create a vote store for the given backend.
+
+    Args:
+        backend (str): "memory" or "sqlite"
+        ttl_seconds (int): Idle time after which a session's votes are forgotten
+        sqlite_path (str): Database file for the sqlite backend
+
+    Returns:
+        MemoryVoteStore or SqliteVoteStore: The vote store
+
+    Raises:
+        ValueError: If the backend is unknown
+    """
+    if backend == 'memory':
+        return MemoryVoteStore(ttl_seconds)
+    if backend == 'sqlite':
+        return SqliteVoteStore(sqlite_path, ttl_seconds)
+    raise ValueError(f"Unknown session backend: {backend!r} (expected one of {', '.join(BACKENDS)})")
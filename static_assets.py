@@ -0,0 +1,185 @@
+"""FLL Team Name Generator - Static Assets Module
+
+Build step for the CSS, JavaScript and images under static/:
+
+1. The stylesheets are bundled in the order base.html used to link them, so a
+   page makes one request instead of five
+2. CSS and JavaScript are minified (conservatively: comments and layout
+   whitespace only)
+3. Every output file gets a content hash in its name ("app.3f9c2a1b7d.css")
+4. Text files are pre-compressed with gzip next to the original
+
+The results and a manifest.json mapping logical names to hashed files go into
+static/dist. Since a hashed file never changes, the app serves it with an
+immutable, year-long cache header. Without a build (or in debug mode) the
+templates fall back to the individual source files.
+
+    python static_assets.py
+"""
+
+import gzip
+import hashlib
+import json
+import os
+import re
+import sys
+
+# Constants
+STATIC_DIR = os.path.join(os.path.dirname(__file__), 'static')
+DIST_DIR = os.path.join(STATIC_DIR, 'dist')
+MANIFEST_FILE = os.path.join(DIST_DIR, 'manifest.json')
+BUNDLES = {
+    'css/app.css': [
+        'css/style.css',
+        'css/button-fix.css',
+        'css/batch-styles.css',
+        'css/nav-spacing.css',
+        'css/responsive-title.css'
+    ],
+    'js/app.js': ['js/main.js']
+}
+FINGERPRINTED = ['images/first-logo.png', 'images/hero1.avif']  # Copied with a hash, not bundled
+COMPRESSIBLE = ('.css', '.js', '.svg', '.json')
+HASH_LENGTH = 10
+
+_CSS_COMMENT = re.compile(r'/\*.*?\*/', re.S)
+_CSS_WHITESPACE = re.compile(r'\s+')
+_CSS_PUNCTUATION = re.compile(r'\s*([{};,>])\s*')
+
+
+def minify_css(text):
+    """
+    Strip comments and layout whitespace from a stylesheet.
+
+    Spaces around ":" are kept, since "a :hover" and "a:hover" differ.
+    """
+    text = _CSS_COMMENT.sub('', text)
+    text = _CSS_WHITESPACE.sub(' ', text)
+    text = _CSS_PUNCTUATION.sub(r'\1', text)
+    return text.replace(';}', '}').strip() + '\n'
+
+
+def minify_js(text):
+    """
+    Strip indentation, blank lines and whole-line // comments from a script.
+
+    Lines inside template literals are left alone. Statements stay on their
+    own lines, so automatic semicolon insertion is unaffected.
+    """
+    lines = []
+    in_template = False
+    for line in text.splitlines():
+        if in_template:
+            lines.append(line)
+        else:
+            stripped = line.strip()
+            if stripped and not stripped.startswith('//'):
+                lines.append(stripped)
+        if line.count('`') % 2:
+            in_template = not in_template
+    return '\n'.join(lines) + '\n'
+
+
+def _hashed_name(name, content):
+    root, ext = os.path.splitext(name)
+    return f"{root}.{hashlib.sha256(content).hexdigest()[:HASH_LENGTH]}{ext}"
+
+
+def _read(path):
+    with open(os.path.join(STATIC_DIR, path), 'rb') as f:
+        return f.read()
+
+
+def _write(dist_dir, name, content):
+    path = os.path.join(dist_dir, name)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    temp_path = f"{path}.tmp"
+    with open(temp_path, 'wb') as f:
+        f.write(content)
+    os.replace(temp_path, path)
+
+
+def build(dist_dir=DIST_DIR):
+    """
+    Bundle, minify, fingerprint and compress the static assets.
+
+    Files from earlier builds that are no longer in the manifest are removed.
+
+    Args:
+        dist_dir (str): Output directory
+
+    Returns:
+        dict: The manifest, logical name -> hashed file name
+    """
+    outputs = {}
+    for name, sources in BUNDLES.items():
+        text = '\n'.join(_read(source).decode('utf-8') for source in sources)
+        text = minify_css(text) if name.endswith('.css') else minify_js(text)
+        outputs[name] = text.encode('utf-8')
+    for name in FINGERPRINTED:
+        if os.path.exists(os.path.join(STATIC_DIR, name)):
+            outputs[name] = _read(name)
+
+    manifest = {}
+    written = {'manifest.json'}
+    for name, content in outputs.items():
+        hashed = _hashed_name(name, content)
+        _write(dist_dir, hashed, content)
+        written.add(hashed)
+        if name.endswith(COMPRESSIBLE):
+            # mtime=0 keeps the .gz byte-identical across builds
+            _write(dist_dir, hashed + '.gz', gzip.compress(content, compresslevel=9, mtime=0))
+            written.add(hashed + '.gz')
+        manifest[name] = hashed
+
+    _write(dist_dir, 'manifest.json', json.dumps(manifest, indent=2).encode('utf-8'))
+
+    for root, _, files in os.walk(dist_dir):
+        for filename in files:
+            path = os.path.join(root, filename)
+            if os.path.relpath(path, dist_dir).replace(os.sep, '/') not in written:
+                os.remove(path)
+
+    return manifest
+
+
+def load_manifest(path=MANIFEST_FILE):
+    """Read the build manifest, or an empty one if the assets haven't been built"""
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {}
+
+
+def asset_files(name, manifest):
+    """
+    Resolve a logical asset name to the files a page should load.
+
+    Args:
+        name (str): Logical name, e.g. "css/app.css" or "images/first-logo.png"
+        manifest (dict): The build manifest; empty to use the source files
+
+    Returns:
+        list: (directory, file name) pairs, where directory is "dist" for built
+            files and "static" for source files
+    """
+    if name in manifest:
+        return [('dist', manifest[name])]
+    return [('static', source) for source in BUNDLES.get(name, [name])]
+
+
+def main():
+    manifest = build()
+    for name, hashed in manifest.items():
+        size = os.path.getsize(os.path.join(DIST_DIR, hashed))
+        sources = BUNDLES.get(name, [name])
+        source_size = sum(os.path.getsize(os.path.join(STATIC_DIR, source)) for source in sources)
+        gz_path = os.path.join(DIST_DIR, hashed + '.gz')
+        gz_note = f", {os.path.getsize(gz_path)} gzipped" if os.path.exists(gz_path) else ""
+        print(f"{name} -> dist/{hashed} ({source_size} -> {size} bytes{gz_note})")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,69 @@
+"""FLL Team Name Generator - Weighted Sampling Module
+
+Walker/Vose alias tables: after an O(n) build, each weighted random pick costs
+O(1) - one random index and one coin flip - no matter how many items there are.
+"""
+
+import random
+
+
+class AliasTable:
+    """Constant-time sampler over a fixed list of weights."""
+
+    def __init__(self, weights):
+        """
+        Build the table.
+
+        Args:
+            weights (list): Non-negative weights, one per item; if they are all
+                zero every item is equally likely
+
+        Raises:
+            ValueError: If weights is empty
+        """
+        count = len(weights)
+        if count == 0:
+            raise ValueError("AliasTable needs at least one weight")
+
+        total = float(sum(weights))
+        if total <= 0:
+            weights = [1.0] * count
+            total = float(count)
+
+        self._count = count
+        self._probability = [weight * count / total for weight in weights]
+        self._alias = list(range(count))
+
+        small = [i for i, p in enumerate(self._probability) if p < 1.0]
+        large = [i for i, p in enumerate(self._probability) if p >= 1.0]
+
+        # Pair each under-full slot with an over-full one
+        while small and large:
+            less = small.pop()
+            more = large.pop()
+            self._alias[less] = more
+            self._probability[more] += self._probability[less] - 1.0
+            if self._probability[more] < 1.0:
+                small.append(more)
+            else:
+                large.append(more)
+
+        # Whatever is left is full up to floating point error
+        for i in small + large:
+            self._probability[i] = 1.0
+
+    def __len__(self):
+        return self._count
+
+    def sample(self, rng=random):
+        """
+        Draw one index with probability proportional to its weight.
+
+        Args:
+            rng (random.Random, optional): Random source; defaults to the random module
+
+        Returns:
+            int: The chosen index
+        """
+        i = int(rng.random() * self._count)
+        return i if rng.random() < self._probability[i] else self._alias[i]